@@ -0,0 +1,156 @@
+"""
+Concurrency stress test for the SQLite performance profile.
+
+Runs the same mix of reader and writer threads against a scratch database
+twice: once the way Django connects by default (rollback journal, a new
+connection per request) and once with task_analyzer.sqlite_tuning applied
+(WAL, tuned pragmas, one persistent connection per thread, BEGIN IMMEDIATE).
+
+    python benchmarks/sqlite_stress.py --readers 8 --writers 4 --duration 5
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_analyzer.sqlite_tuning import PRAGMAS, init_command  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE tasks_task (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    estimated_hours REAL NOT NULL,
+    importance INTEGER NOT NULL,
+    is_completed INTEGER NOT NULL,
+    priority_score REAL
+)
+"""
+
+READ_QUERY = (
+    "SELECT id, title, due_date, priority_score FROM tasks_task "
+    "WHERE is_completed = 0 ORDER BY priority_score DESC LIMIT 50"
+)
+WRITE_QUERY = "UPDATE tasks_task SET priority_score = ? WHERE id = ?"
+
+
+def seed(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    today = date.today()
+    conn.executemany(
+        "INSERT INTO tasks_task VALUES (?, ?, ?, ?, ?, 0, ?)",
+        (
+            (i, f"Task {i}", (today + timedelta(days=i % 60)).isoformat(),
+             1 + i % 8, 1 + i % 10, random.random() * 100)
+            for i in range(1, rows + 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+class Profile:
+    """How a worker thread obtains and uses its connection"""
+
+    def __init__(self, name, path, tuned):
+        self.name = name
+        self.path = path
+        self.tuned = tuned
+        self.local = threading.local()
+
+    def connect(self):
+        if not self.tuned:
+            # Django default: CONN_MAX_AGE=0, 5s timeout, rollback journal
+            return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=PRAGMAS['busy_timeout'] / 1000,
+                isolation_level=None, check_same_thread=False,
+            )
+            for statement in init_command().split(';'):
+                conn.execute(statement)
+            self.local.conn = conn
+        return conn
+
+    def release(self, conn):
+        if not self.tuned:
+            conn.close()
+
+    def begin_write(self, conn):
+        conn.execute("BEGIN IMMEDIATE" if self.tuned else "BEGIN")
+
+
+def worker(profile, kind, rows, deadline, results):
+    ops = errors = 0
+    while time.perf_counter() < deadline:
+        conn = profile.connect()
+        try:
+            if kind == 'read':
+                conn.execute(READ_QUERY).fetchall()
+            else:
+                profile.begin_write(conn)
+                for _ in range(10):
+                    conn.execute(WRITE_QUERY, (random.random() * 100, random.randint(1, rows)))
+                conn.execute("COMMIT")
+            ops += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+        finally:
+            profile.release(conn)
+    results.append((kind, ops, errors))
+
+
+def run(profile, readers, writers, rows, duration):
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(profile, kind, rows, deadline, results))
+        for kind in ['read'] * readers + ['write'] * writers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = {'profile': profile.name}
+    for kind in ('read', 'write'):
+        ops = sum(r[1] for r in results if r[0] == kind)
+        errors = sum(r[2] for r in results if r[0] == kind)
+        summary[f'{kind}s_per_second'] = round(ops / duration, 1)
+        summary[f'{kind}_errors'] = errors
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    reports = []
+    for name, tuned in (('default', False), ('tuned', True)):
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, 'stress.sqlite3')
+            seed(path, args.rows)
+            reports.append(run(Profile(name, path, tuned), args.readers,
+                               args.writers, args.rows, args.duration))
+
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Cold-start benchmark for worker processes and management commands.
+
+Times fresh interpreter processes for each startup path (median of
+--runs) and profiles imports with `python -X importtime` to show which
+modules dominate.
+
+    python benchmarks/startup.py --runs 10 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP = (
+    "import os, django;"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_analyzer.settings');"
+)
+
+SCENARIOS = {
+    'django_setup': SETUP + "django.setup()",
+    'wsgi_application': "import task_analyzer.wsgi",
+    'asgi_application': "import task_analyzer.asgi",
+    'tasks_app': SETUP + "django.setup(); import tasks.views, tasks.worker",
+}
+
+
+def environment():
+    env = dict(os.environ)
+    env.setdefault('SECRET_KEY', 'startup-benchmark')
+    return env
+
+
+def time_process(args, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(args, cwd=BACKEND_DIR, env=environment(), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': round(statistics.median(timings), 1),
+        'min_ms': round(min(timings), 1),
+    }
+
+
+def import_profile(code, top):
+    """Slowest modules by cumulative import time (microseconds)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BACKEND_DIR, env=environment(), check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:   self_us |   cumulative_us | [indent]module"
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+    modules.sort(key=lambda module: module['cumulative_us'], reverse=True)
+    return modules[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    report = {'python': sys.version.split()[0], 'scenarios': {}}
+    for name, code in SCENARIOS.items():
+        report['scenarios'][name] = time_process([sys.executable, '-c', code], args.runs)
+    report['scenarios']['manage_check'] = time_process(
+        [sys.executable, 'manage.py', 'check'], args.runs
+    )
+    report['import_profile'] = import_profile(SCENARIOS['wsgi_application'], args.top)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from decouple import config
+from .sqlite_tuning import database_options
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -68,6 +69,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'task_analyzer.wsgi.application'
 
+# Import views, DRF and the router when the WSGI/ASGI application loads so
+# pre-forked workers share them. See task_analyzer/startup.py
+PRELOAD_APP = config('PRELOAD_APP', default=True, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -76,9 +81,72 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # A file rather than shared-cache memory, so tests with concurrent
+        # connections see SQLite's real locking (waiting on the busy timeout)
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# WAL journaling, tuned pragmas and persistent connections for deployments
+# with concurrent readers and writers. See task_analyzer/sqlite_tuning.py
+SQLITE_PERFORMANCE_PROFILE = config('SQLITE_PERFORMANCE_PROFILE', default=False, cast=bool)
+
+if SQLITE_PERFORMANCE_PROFILE:
+    DATABASES['default'].update({
+        'OPTIONS': database_options(),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+    })
+
+# Rescoring runs in `manage.py run_scoring_worker` when enabled; otherwise
+# analyze drains the scoring queue inline.
+SCORING_WORKER_ENABLED = config('SCORING_WORKER_ENABLED', default=False, cast=bool)
+
+# Caches
+# The dependency graph cache can be 'locmem', 'file' (shared between worker
+# processes on one host) or a dotted path to any Django cache backend.
+# Invalidation only reaches the cache of the process making the write, so
+# locmem is only correct for a single process: it is the default only when
+# there is no scoring worker and one web worker (gunicorn's WEB_CONCURRENCY),
+# and its entries expire after GRAPH_CACHE_TIMEOUT seconds so a change made
+# by another process is picked up eventually.
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+MULTI_PROCESS = SCORING_WORKER_ENABLED or config('WEB_CONCURRENCY', default=1, cast=int) > 1
+GRAPH_CACHE_BACKEND = config(
+    'GRAPH_CACHE_BACKEND', default='file' if MULTI_PROCESS else 'locmem'
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dependency_graph': {
+        'BACKEND': CACHE_BACKENDS.get(GRAPH_CACHE_BACKEND, GRAPH_CACHE_BACKEND),
+        'LOCATION': config(
+            'GRAPH_CACHE_LOCATION',
+            default=str(BASE_DIR / '.cache' / 'dependency_graph')
+            if GRAPH_CACHE_BACKEND == 'file' else 'dependency-graph'
+        ),
+        # Shared backends see every invalidation, so entries can live forever
+        'TIMEOUT': config(
+            'GRAPH_CACHE_TIMEOUT', default=60 if GRAPH_CACHE_BACKEND == 'locmem' else None,
+            cast=lambda value: None if str(value).lower() in ('', 'none') else int(value)
+        ),
+    },
+}
+
+# A running scoring job older than this is presumed abandoned by a crashed
+# worker; it is failed and queued again. Keep it above the longest rescore.
+SCORING_JOB_LEASE_SECONDS = config('SCORING_JOB_LEASE_SECONDS', default=900, cast=int)
+
+# Recurring tasks are created this many days ahead of their due date, by
+# the scoring worker, so only near occurrences are stored and scored.
+RECURRENCE_HORIZON_DAYS = config('RECURRENCE_HORIZON_DAYS', default=14, cast=int)
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
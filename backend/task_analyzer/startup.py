@@ -0,0 +1,23 @@
+"""
+Warm-up for WSGI/ASGI worker processes.
+
+Resolving the URLconf imports the views, DRF and the router, and touching
+the DRF settings imports the renderer/parser classes they name. Doing this
+at application load means a pre-forking server (e.g. gunicorn --preload)
+pays the cost once in the master and every forked worker shares those
+pages, instead of each worker paying it on its first request.
+"""
+from django.db import connections
+from django.urls import get_resolver
+
+
+def preload():
+    get_resolver().url_patterns
+
+    from rest_framework.settings import api_settings
+    for setting in ('DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES',
+                    'DEFAULT_PERMISSION_CLASSES', 'DEFAULT_AUTHENTICATION_CLASSES'):
+        getattr(api_settings, setting)
+
+    # Never hand a database connection opened during warm-up to forked children
+    connections.close_all()
@@ -1,11 +1,23 @@
 from django.contrib import admin
-from .models import Task, UserPreferences
+from .models import RecurringTask, Task, UserPreferences, ScoringJob, Workspace
+
+@admin.register(Workspace)
+class WorkspaceAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'created_at']
+    prepopulated_fields = {'slug': ['name']}
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ['title', 'due_date', 'importance', 'estimated_hours', 'priority_score', 'is_completed']
-    list_filter = ['is_completed', 'importance']
+    list_display = ['title', 'workspace', 'due_date', 'importance', 'estimated_hours', 'priority_score', 'is_completed']
+    list_filter = ['workspace', 'is_completed', 'importance']
+    search_fields = ['title']
+
+@admin.register(RecurringTask)
+class RecurringTaskAdmin(admin.ModelAdmin):
+    list_display = ['title', 'workspace', 'frequency', 'interval', 'start_date', 'end_date', 'is_active', 'materialized_until']
+    list_filter = ['workspace', 'frequency', 'is_active']
     search_fields = ['title']
+    readonly_fields = ['materialized_until']
 
 @admin.register(UserPreferences)
 class UserPreferencesAdmin(admin.ModelAdmin):
@@ -13,4 +25,9 @@ class UserPreferencesAdmin(admin.ModelAdmin):
     
     def get_readonly_fields(self, request, obj=None):
         # Make weights editable but show validation
-        return []
\ No newline at end of file
+        return []
+
+@admin.register(ScoringJob)
+class ScoringJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'workspace', 'kind', 'status', 'scoring_date', 'request_count', 'tasks_scored', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind']
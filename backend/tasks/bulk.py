@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .dependencies import neighbours, refresh_blocked, rescore, resolve_completion
+from .events import notify_priority_change
+from .graph import invalidate_dependency_graph
+from .models import Task
+from .signals import bulk_changes
+
+ACTIONS = ('complete', 'reprioritize', 'delete')
+
+
+def apply_bulk_action(queryset, action, workspace_id=None, scorer=None, changes=None):
+    """
+    Apply one action to every task in queryset inside a transaction, using
+    single UPDATE/DELETE statements, then do the dependency bookkeeping and
+    one incremental rescore for the whole batch.
+    Returns a summary with the matched ids and the rescored task ids.
+    """
+    with transaction.atomic(), bulk_changes():
+        if action == 'complete':
+            task_ids = set(queryset.filter(is_completed=False).values_list('id', flat=True))
+            Task.objects.filter(id__in=task_ids).update(
+                is_completed=True, updated_at=timezone.now()
+            )
+            affected = resolve_completion(task_ids, scorer)
+        
+        elif action == 'reprioritize':
+            task_ids = set(queryset.values_list('id', flat=True))
+            Task.objects.filter(id__in=task_ids).update(
+                updated_at=timezone.now(), **changes
+            )
+            affected = {task.id for task in rescore(task_ids, scorer)}
+        
+        elif action == 'delete':
+            task_ids = set(queryset.values_list('id', flat=True))
+            dependent_ids, dependency_ids = neighbours(task_ids)
+            dependent_ids -= task_ids
+            _drop_dependencies(dependent_ids, task_ids)
+            Task.objects.filter(id__in=task_ids).delete()
+            refresh_blocked(dependent_ids)
+            affected = {
+                task.id for task in rescore((dependent_ids | dependency_ids) - task_ids, scorer)
+            }
+            transaction.on_commit(lambda: invalidate_dependency_graph(workspace_id))
+        
+        else:
+            raise ValueError(f"Unknown bulk action '{action}'")
+        
+        transaction.on_commit(lambda: notify_priority_change(workspace_id))
+    
+    return {
+        'action': action,
+        'task_ids': sorted(task_ids),
+        'rescored': sorted(affected),
+    }
+
+
+def _drop_dependencies(task_ids, removed_ids):
+    """Strip removed task ids out of the JSON dependency lists of task_ids"""
+    tasks = list(Task.objects.filter(id__in=task_ids).only('id', 'dependencies'))
+    for task in tasks:
+        task.dependencies = [dep_id for dep_id in task.dependencies if dep_id not in removed_ids]
+    Task.objects.bulk_update(tasks, ['dependencies'])
@@ -0,0 +1,96 @@
+"""
+Dependency bookkeeping backed by the TaskDependency edge table.
+
+Keeps edges and Task.is_blocked in step with Task.dependencies and turns
+a completion into one indexed lookup of the affected tasks plus a
+targeted rescore, instead of reloading the whole backlog.
+"""
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import Task, TaskDependency
+from .scoring import TaskScorer
+
+
+def sync_dependency_edges(task):
+    """Mirror task.dependencies into TaskDependency rows"""
+    wanted = set(
+        Task.objects.filter(
+            id__in=set(task.dependencies), workspace_id=task.workspace_id
+        ).exclude(id=task.id).values_list('id', flat=True)
+    )
+    current = set(
+        TaskDependency.objects.filter(task=task).values_list('depends_on_id', flat=True)
+    )
+    if current - wanted:
+        TaskDependency.objects.filter(task=task, depends_on_id__in=current - wanted).delete()
+    if wanted - current:
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=task, depends_on_id=dep_id) for dep_id in wanted - current
+        ], ignore_conflicts=True)
+
+
+def refresh_blocked(task_ids):
+    """Recompute is_blocked for the given tasks in a single UPDATE"""
+    open_dependency = TaskDependency.objects.filter(
+        task=OuterRef('pk'), depends_on__is_completed=False
+    )
+    return Task.objects.filter(id__in=task_ids).update(is_blocked=Exists(open_dependency))
+
+
+def rescore(task_ids, scorer=None):
+    """
+    Recompute priority_score for the given open tasks only.
+    Blocked counts come from one grouped query over the edge table.
+    """
+    scorer = scorer or TaskScorer()
+    tasks = list(Task.objects.filter(id__in=task_ids, is_completed=False))
+    blocked_counts = dict(
+        TaskDependency.objects
+        .filter(depends_on__in=task_ids, task__is_completed=False)
+        .values('depends_on')
+        .annotate(count=Count('id'))
+        .values_list('depends_on', 'count')
+    )
+    for task in tasks:
+        task.priority_score = scorer.score_task(task, blocked_counts.get(task.id, 0))
+    Task.objects.bulk_update(tasks, ['priority_score'])
+    return tasks
+
+
+def neighbours(task_ids):
+    """
+    (dependent_ids, dependency_ids) of the given tasks, read from the edge
+    table in one indexed query
+    """
+    task_ids = set(task_ids)
+    dependent_ids = set()
+    dependency_ids = set()
+    edges = TaskDependency.objects.filter(
+        Q(depends_on_id__in=task_ids) | Q(task_id__in=task_ids)
+    ).values_list('task_id', 'depends_on_id')
+    for task_id, depends_on_id in edges:
+        if depends_on_id in task_ids:
+            dependent_ids.add(task_id)
+        if task_id in task_ids:
+            dependency_ids.add(depends_on_id)
+    return dependent_ids, dependency_ids
+
+
+def resolve_completion(task_ids, scorer=None):
+    """
+    Handle tasks being completed (or reopened).
+    Their dependents may become ready (or blocked again), and the tasks they
+    depend on now block one task fewer (or more), so both sides are rescored
+    with scorer (a fresh TaskScorer by default).
+    Returns the ids of the affected tasks.
+    """
+    dependent_ids, dependency_ids = neighbours(task_ids)
+    refresh_blocked(dependent_ids)
+    affected = dependent_ids | dependency_ids
+    rescore(affected, scorer)
+    return affected
+
+
+def ready_tasks(queryset):
+    """Open tasks whose dependencies are all done, answered from the index"""
+    return queryset.filter(is_completed=False, is_blocked=False)
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import PriorityVersion
+from .scoring import TaskScorer
+from .tenancy import workspace_tasks
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_COUNT = 3
+KEEPALIVE_SECONDS = 15
+QUEUE_SIZE = 100
+# How often a broadcaster with subscribers checks for writes made elsewhere
+POLL_SECONDS = 1.0
+
+
+def build_priority_snapshot(workspace_id=None):
+    """Score a workspace's incomplete tasks once and pick the top suggestions"""
+    tasks = list(workspace_tasks(workspace_id).filter(is_completed=False))
+    scores = TaskScorer().score_tasks(tasks)
+    titles = {task.id: task.title for task in tasks}
+
+    top = sorted(scores, key=lambda task_id: scores[task_id], reverse=True)
+    suggestions = [
+        {'id': task_id, 'title': titles[task_id], 'score': scores[task_id]}
+        for task_id in top[:SUGGESTION_COUNT]
+    ]
+    return {'scores': scores, 'suggestions': suggestions}
+
+
+def bump_priority_version(workspace_id=None):
+    """Record a committed change in the counter every process can see"""
+    key = workspace_id or 0
+    versions = PriorityVersion.objects.filter(workspace_key=key)
+    if versions.update(version=F('version') + 1):
+        return
+    try:
+        with transaction.atomic():
+            PriorityVersion.objects.create(workspace_key=key, version=1)
+    except IntegrityError:
+        # Another process created the row first
+        versions.update(version=F('version') + 1)
+
+
+def read_priority_version(workspace_id=None):
+    version = (
+        PriorityVersion.objects.filter(workspace_key=workspace_id or 0)
+        .values_list('version', flat=True).first()
+    )
+    return version or 0
+
+
+def format_event(event, data):
+    """Encode a single Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class PriorityBroadcaster:
+    """
+    Pushes one workspace's priority changes to its connected SSE clients.
+    Task writes only mark the state dirty; the snapshot is then rebuilt
+    once on the event loop and the same encoded frames are fanned out to
+    all subscribers, so the cost does not grow with the number of clients.
+    Writes in this process notify it directly; with poll_interval set it
+    also watches the shared PriorityVersion counter for writes made by
+    other processes.
+    """
+
+    def __init__(self, workspace_id=None, debounce=0.25, poll_interval=None):
+        self.workspace_id = workspace_id
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._subscribers = set()
+        self._loop = None
+        self._dirty = False
+        self._publisher = None
+        self._watcher = None
+        self._snapshot = None
+        # Counter version read just before _snapshot was built
+        self._version = None
+
+    def subscribe(self):
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self.poll_interval and (self._watcher is None or self._watcher.done()):
+            self._watcher = asyncio.ensure_future(self._watch())
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+        if self._subscribers:
+            return
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        # Nothing keeps the snapshot current without subscribers, so the
+        # next one starts from a fresh build
+        self._snapshot = None
+        self._version = None
+
+    def notify(self):
+        """Signal that tasks changed; safe to call from any thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._subscribers:
+            # Nobody is listening; just forget the cached snapshot
+            self._snapshot = None
+            return
+        loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self):
+        self._dirty = True
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.ensure_future(self._publish())
+
+    async def _publish(self):
+        # Writes arriving while a snapshot is computed set _dirty again
+        # and are folded into the next round instead of piling up.
+        while self._dirty:
+            await asyncio.sleep(self.debounce)
+            self._dirty = False
+            try:
+                version, snapshot = await sync_to_async(self._load)()
+            except Exception:
+                logger.exception(
+                    "Failed to build priority snapshot for workspace %s", self.workspace_id
+                )
+                continue
+            if not self._subscribers:
+                break
+            frames = self._diff(snapshot)
+            self._version = version
+            for queue in list(self._subscribers):
+                for frame in frames:
+                    self._offer(queue, frame)
+
+    def _load(self):
+        """Read the counter, then build the snapshot it is at least as new as"""
+        version = read_priority_version(self.workspace_id) if self.poll_interval else None
+        return version, build_priority_snapshot(self.workspace_id)
+
+    async def _watch(self):
+        seen = None
+        while self._subscribers:
+            try:
+                version = await sync_to_async(read_priority_version)(self.workspace_id)
+            except Exception:
+                logger.exception(
+                    "Failed to read priority version for workspace %s", self.workspace_id
+                )
+            else:
+                # Compare against the version the snapshot was built at, so
+                # writes made while it was being built are not missed
+                baseline = self._version if self._version is not None else seen
+                if baseline is not None and version != baseline:
+                    self._schedule()
+                seen = version
+            await asyncio.sleep(self.poll_interval)
+
+    def _diff(self, snapshot):
+        previous = self._snapshot or {'scores': {}, 'suggestions': []}
+        self._snapshot = snapshot
+        frames = []
+
+        old_scores, new_scores = previous['scores'], snapshot['scores']
+        changed = {
+            task_id: score for task_id, score in new_scores.items()
+            if old_scores.get(task_id) != score
+        }
+        removed = [task_id for task_id in old_scores if task_id not in new_scores]
+        if changed or removed:
+            frames.append(format_event('scores', {
+                'changed': changed,
+                'removed': removed,
+            }))
+
+        if snapshot['suggestions'] != previous['suggestions']:
+            frames.append(format_event('suggestions', {
+                'suggestions': snapshot['suggestions'],
+            }))
+        return frames
+
+    def _offer(self, queue, frame):
+        if queue.full():
+            # Slow client: drop its oldest frame rather than block everyone
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+    async def stream(self):
+        """Async iterator of SSE frames for one client connection"""
+        queue = self.subscribe()
+        try:
+            if self._snapshot is None:
+                self._version, self._snapshot = await sync_to_async(self._load)()
+            yield format_event('snapshot', self._snapshot)
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+
+_broadcasters = {}
+
+
+def get_broadcaster(workspace_id=None):
+    """The broadcaster for a workspace, created on first use"""
+    broadcaster = _broadcasters.get(workspace_id)
+    if broadcaster is None:
+        broadcaster = _broadcasters.setdefault(
+            workspace_id, PriorityBroadcaster(workspace_id, poll_interval=POLL_SECONDS)
+        )
+    return broadcaster
+
+
+def notify_priority_change(workspace_id=None):
+    """
+    Tell a workspace's subscribers that tasks changed: directly in this
+    process, and through the shared counter in every other one
+    """
+    bump_priority_version(workspace_id)
+    broadcaster = _broadcasters.get(workspace_id)
+    if broadcaster is not None:
+        broadcaster.notify()
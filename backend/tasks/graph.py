@@ -0,0 +1,82 @@
+import time
+
+from django.core.cache import caches
+
+from .scoring import find_circular_tasks
+from .tenancy import workspace_tasks
+
+GRAPH_CACHE_ALIAS = 'dependency_graph'
+VERSION_KEY = 'dependency_graph:{workspace_id}:version'
+GRAPH_KEY = 'dependency_graph:{workspace_id}:data'
+
+
+def build_dependency_graph(workspace_id=None):
+    """Compute nodes, edges and cycle flags for every task in a workspace"""
+    tasks = workspace_tasks(workspace_id).values_list('id', 'title', 'dependencies')
+    
+    # Build dependency map
+    dep_map = {task_id: list(dependencies) for task_id, _, dependencies in tasks}
+    
+    # Find circular dependencies
+    circular_tasks = find_circular_tasks(dep_map)
+    
+    # Build graph data
+    nodes = []
+    edges = []
+    
+    for task_id, title, dependencies in tasks:
+        nodes.append({
+            'id': task_id,
+            'title': title,
+            'has_cycle': task_id in circular_tasks
+        })
+        
+        for dep_id in dependencies:
+            edges.append({
+                'from': dep_id,  # Dependency
+                'to': task_id,    # Task that depends on it
+                'has_cycle': task_id in circular_tasks or dep_id in circular_tasks
+            })
+    
+    return {
+        'nodes': nodes,
+        'edges': edges,
+        'has_cycles': len(circular_tasks) > 0
+    }
+
+
+def _initial_version():
+    # Start from the clock so a version key that was evicted can't come back
+    # at a number an older cached graph is still stored under
+    return time.time_ns() // 1000
+
+
+def _graph_version(cache, version_key):
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, _initial_version())
+        version = cache.get(version_key)
+    return version
+
+
+def get_dependency_graph(workspace_id=None):
+    """Return the workspace graph for its current version, building it on a miss"""
+    cache = caches[GRAPH_CACHE_ALIAS]
+    version = _graph_version(cache, VERSION_KEY.format(workspace_id=workspace_id))
+    graph_key = GRAPH_KEY.format(workspace_id=workspace_id)
+    graph = cache.get(graph_key, version=version)
+    if graph is None:
+        graph = build_dependency_graph(workspace_id)
+        cache.set(graph_key, graph, version=version)
+    return graph
+
+
+def invalidate_dependency_graph(workspace_id=None):
+    """Bump the workspace graph version so the next read rebuilds it"""
+    cache = caches[GRAPH_CACHE_ALIAS]
+    version_key = VERSION_KEY.format(workspace_id=workspace_id)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Version key expired or was never set
+        cache.set(version_key, _initial_version())
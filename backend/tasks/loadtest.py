@@ -0,0 +1,348 @@
+"""
+Load-test harness for the task endpoints.
+
+Seeds a scratch workspace with a synthetic backlog, then drives a weighted
+mix of requests from concurrent clients, either in-process through the
+ASGI application or over HTTP against a running server, and reports
+throughput and latency percentiles per endpoint.
+
+    python manage.py loadtest --tasks 1000,10000 --mix suggest=4,analyze=1
+"""
+import asyncio
+import math
+import random
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.db import close_old_connections, transaction
+
+from .dependencies import refresh_blocked
+from .graph import invalidate_dependency_graph
+from .models import Task, TaskDependency, Workspace
+from .signals import bulk_changes
+from .tenancy import WORKSPACE_HEADER
+from .worker import rescore_tasks
+
+ENDPOINTS = {
+    'list': ('GET', '/api/tasks/'),
+    'analyze': ('POST', '/api/tasks/analyze/'),
+    'suggest': ('GET', '/api/tasks/suggest/'),
+    'eisenhower_matrix': ('GET', '/api/tasks/eisenhower_matrix/'),
+    'dependency_graph': ('GET', '/api/tasks/dependency_graph/'),
+    'ready': ('GET', '/api/tasks/ready/'),
+    'stats': ('GET', '/api/tasks/stats/'),
+    'plan': ('GET', '/api/tasks/plan/'),
+}
+
+DEFAULT_MIX = 'analyze=1,suggest=1,eisenhower_matrix=1,dependency_graph=1'
+PERCENTILES = (50, 95, 99)
+
+
+class LoadTestError(Exception):
+    pass
+
+
+def parse_mix(spec):
+    """
+    'suggest=3,analyze=1' -> {'suggest': 0.75, 'analyze': 0.25}.
+    A bare endpoint name gets weight 1.
+    """
+    weights = {}
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(
+                f"Unknown endpoint '{name}', use one of: {', '.join(ENDPOINTS)}"
+            )
+        try:
+            weight = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Weight for '{name}' must be a number")
+        if weight < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative")
+        weights[name] = weights.get(name, 0) + weight
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("The request mix needs at least one positive weight")
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list, None if empty"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def summarize(samples, elapsed):
+    """Per-endpoint report from {name: [(seconds, ok), ...]}"""
+    report = {}
+    for name, results in sorted(samples.items()):
+        latencies = sorted(seconds * 1000 for seconds, _ in results)
+        summary = {
+            'requests': len(results),
+            'errors': sum(1 for _, ok in results if not ok),
+            'throughput_rps': round(len(results) / elapsed, 1) if elapsed else 0.0,
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'max_ms': round(latencies[-1], 2) if latencies else None,
+        }
+        for pct in PERCENTILES:
+            value = percentile(latencies, pct)
+            summary[f'p{pct}_ms'] = round(value, 2) if value is not None else None
+        report[name] = summary
+    return report
+
+
+# Seeding
+
+def claim_workspace(slug, reuse=False):
+    """
+    The workspace to seed, returns (workspace, created).
+    An existing workspace is only used with reuse, since seeding replaces
+    its tasks; only a workspace created here is dropped afterwards.
+    """
+    with transaction.atomic():
+        workspace, created = Workspace.objects.get_or_create(
+            slug=slug, defaults={'name': f"Load test ({slug})"}
+        )
+    if not created and not reuse:
+        raise LoadTestError(
+            f"Workspace '{slug}' already exists and seeding would delete its tasks; "
+            "pick another slug or pass --reuse"
+        )
+    return workspace, created
+
+
+def seed_workspace(workspace, task_count, max_dependencies=3, seed=0):
+    """
+    Replace the workspace's tasks with task_count synthetic ones.
+    Each task may depend on a few earlier ones, so the graph is acyclic.
+    Signals are suspended and edges written in bulk.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    clear_tasks(workspace)
+
+    with transaction.atomic(), bulk_changes():
+        Task.objects.bulk_create([
+            Task(
+                workspace=workspace,
+                title=f"Load test task {i}",
+                due_date=today + timedelta(days=rng.randint(-5, 60)),
+                estimated_hours=rng.choice([0.5, 1, 2, 3, 5, 8]),
+                importance=rng.randint(1, 10),
+                is_completed=rng.random() < 0.2,
+            )
+            for i in range(task_count)
+        ], batch_size=1000)
+
+        tasks = list(Task.objects.filter(workspace=workspace).only('id').order_by('id'))
+        edges = []
+        for index, task in enumerate(tasks[1:], start=1):
+            # Depend on recent tasks only, like real chains of work
+            window = range(max(0, index - 50), index)
+            count = min(rng.randint(0, max_dependencies), len(window))
+            task.dependencies = sorted(tasks[j].id for j in rng.sample(window, count))
+            edges.extend(
+                TaskDependency(task_id=task.id, depends_on_id=dep_id)
+                for dep_id in task.dependencies
+            )
+        Task.objects.bulk_update(tasks[1:], ['dependencies'], batch_size=1000)
+        TaskDependency.objects.bulk_create(edges, batch_size=1000)
+        refresh_blocked(Task.objects.filter(workspace=workspace).values('id'))
+
+    rescore_tasks(workspace.id)
+    invalidate_dependency_graph(workspace.id)
+    return workspace
+
+
+def clear_tasks(workspace):
+    with transaction.atomic(), bulk_changes():
+        Task.objects.filter(workspace=workspace).delete()
+    invalidate_dependency_graph(workspace.id)
+
+
+def drop_workspace(workspace):
+    with transaction.atomic(), bulk_changes():
+        workspace.delete()
+    invalidate_dependency_graph(workspace.id)
+
+
+# Clients
+
+class InProcessClient:
+    """Calls Django's ASGI handler directly, no network or test client involved"""
+
+    def __init__(self, workspace_slug):
+        from django.conf import settings
+        from django.core.handlers.asgi import ASGIHandler
+        self.app = ASGIHandler()
+        self.target = 'asgi'
+        host = next(
+            (h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')),
+            'localhost'
+        )
+        self.headers = [
+            (b'host', host.encode()),
+            (WORKSPACE_HEADER.lower().encode(), workspace_slug.encode()),
+        ]
+
+    async def send(self, method, path):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': self.headers,
+            'client': ('127.0.0.1', 0),
+            'server': ('127.0.0.1', 80),
+        }
+        body_sent = False
+        status = None
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # The client never disconnects; the handler cancels this wait
+            await asyncio.Event().wait()
+
+        async def send_message(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        await self.app(scope, receive, send_message)
+        return status is not None and status < 400
+
+    def close(self):
+        pass
+
+
+class HTTPClient:
+    """Blocking urllib requests, run on a thread per concurrent client"""
+
+    def __init__(self, base_url, workspace_slug, concurrency, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.target = self.base_url
+        self.headers = {WORKSPACE_HEADER: workspace_slug}
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def _request(self, method, path):
+        request = urllib.request.Request(
+            self.base_url + path, method=method, headers=self.headers,
+            data=b'' if method == 'POST' else None,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status < 400
+        except (urllib.error.URLError, TimeoutError):
+            return False
+
+    async def send(self, method, path):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._request, method, path)
+
+    def close(self):
+        self.executor.shutdown()
+
+
+# Driver
+
+async def drive(client, mix, concurrency, duration, seed=0):
+    """
+    Run concurrency clients for duration seconds, each picking endpoints
+    by the mix weights. Returns ({name: [(seconds, ok), ...]}, elapsed).
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = {name: [] for name in names}
+    deadline = time.perf_counter() + duration
+
+    async def run_client():
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path = ENDPOINTS[name]
+            started = time.perf_counter()
+            try:
+                ok = await client.send(method, path)
+            except Exception:
+                ok = False
+            samples[name].append((time.perf_counter() - started, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def current_commit():
+    """The checked-out commit, so reports can be compared across commits"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_load_test(task_counts, mix, concurrency=8, duration=10.0,
+                  target=None, workspace_slug='loadtest', keep=False, reuse=False,
+                  seed=0):
+    """
+    Seed and load-test each backlog size in turn, returns the report.
+    A workspace the run created is dropped afterwards unless keep is set;
+    a reused one keeps the seeded tasks.
+    """
+    workspace, created = claim_workspace(workspace_slug, reuse)
+    runs = []
+    try:
+        for task_count in task_counts:
+            seed_workspace(workspace, task_count, seed=seed)
+            if target:
+                client = HTTPClient(target, workspace_slug, concurrency)
+            else:
+                client = InProcessClient(workspace_slug)
+            try:
+                samples, elapsed = asyncio.run(drive(client, mix, concurrency, duration, seed))
+            finally:
+                client.close()
+                close_old_connections()
+
+            total = sum(len(results) for results in samples.values())
+            runs.append({
+                'tasks': task_count,
+                'elapsed_seconds': round(elapsed, 2),
+                'throughput_rps': round(total / elapsed, 1) if elapsed else 0.0,
+                'endpoints': summarize(samples, elapsed),
+            })
+    finally:
+        if created and not keep:
+            drop_workspace(workspace)
+
+    return {
+        'commit': current_commit(),
+        'target': target or 'asgi',
+        'concurrency': concurrency,
+        'duration_seconds': duration,
+        'mix': mix,
+        'runs': runs,
+    }
@@ -0,0 +1,75 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.loadtest import DEFAULT_MIX, LoadTestError, parse_mix, run_load_test
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic backlog and report per-endpoint throughput and latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks', default='1000',
+            help="Backlog sizes to test, comma separated (e.g. 1000,10000)"
+        )
+        parser.add_argument(
+            '--mix', default=DEFAULT_MIX,
+            help="Weighted endpoints, e.g. suggest=4,analyze=1"
+        )
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument(
+            '--duration', type=float, default=10.0,
+            help="Seconds to drive load for each backlog size"
+        )
+        parser.add_argument(
+            '--target',
+            help="Base URL of a running server (e.g. http://127.0.0.1:8000); "
+                 "defaults to the in-process ASGI app"
+        )
+        parser.add_argument(
+            '--workspace', default='loadtest',
+            help="Slug of the scratch workspace the synthetic tasks go in; "
+                 "it must not exist yet unless --reuse is given"
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help="Leave the seeded workspace in place afterwards"
+        )
+        parser.add_argument(
+            '--reuse', action='store_true',
+            help="Seed an existing workspace, replacing its tasks; it is never dropped"
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        try:
+            task_counts = [int(count) for count in options['tasks'].split(',') if count]
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if not task_counts or min(task_counts) < 1:
+            raise CommandError("--tasks needs one or more positive sizes")
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError("--concurrency and --duration must be positive")
+
+        try:
+            report = run_load_test(
+                task_counts, mix,
+                concurrency=options['concurrency'],
+                duration=options['duration'],
+                target=options['target'],
+                workspace_slug=options['workspace'],
+                keep=options['keep'],
+                reuse=options['reuse'],
+                seed=options['seed'],
+            )
+        except LoadTestError as e:
+            raise CommandError(str(e))
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.worker import DEFAULT_BATCH_SIZE, ensure_daily_rollover, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued rescoring jobs and the daily urgency rollover"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Drain the queue once and exit (for cron)"
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help="Seconds to sleep between polls of the queue"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help="Tasks scored and written per batch"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            ensure_daily_rollover()
+            processed = run_pending_jobs(options['batch_size'])
+            if processed:
+                self.stdout.write(f"Processed {processed} scoring job(s)")
+
+            if options['once']:
+                return
+            time.sleep(options['interval'])
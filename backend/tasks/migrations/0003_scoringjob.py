@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_userpreferences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('rescore', 'Rescore'), ('rollover', 'Daily urgency rollover')], default='rescore', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('scoring_date', models.DateField(help_text='Date urgency is computed against')),
+                ('request_count', models.PositiveIntegerField(default=1, help_text='Number of rescore requests coalesced into this job')),
+                ('tasks_scored', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='tasks_scori_status_e1fc2f_idx'), models.Index(fields=['kind', 'scoring_date'], name='tasks_scori_kind_9c9527_idx')],
+            },
+        ),
+    ]
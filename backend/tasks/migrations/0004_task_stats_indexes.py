@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_scoringjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['is_completed', 'due_date'], name='tasks_task_is_comp_9958ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['is_completed', 'importance'], name='tasks_task_is_comp_4b9d21_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_stats_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Workspace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='scoringjob',
+            name='tasks_scori_kind_9c9527_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_is_comp_9958ca_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_is_comp_4b9d21_idx',
+        ),
+        migrations.AddField(
+            model_name='scoringjob',
+            name='workspace',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='tasks.workspace'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='workspace',
+            field=models.ForeignKey(blank=True, help_text='Owning workspace; empty for the default shared workspace', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='tasks.workspace'),
+        ),
+        migrations.AddIndex(
+            model_name='scoringjob',
+            index=models.Index(fields=['workspace', 'scoring_date'], name='tasks_scori_workspa_b07e5c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'is_completed', 'due_date'], name='tasks_task_workspa_64ed5d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'is_completed', 'importance'], name='tasks_task_workspa_865b80_idx'),
+        ),
+    ]
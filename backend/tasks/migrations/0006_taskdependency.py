@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_workspace'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='is_blocked',
+            field=models.BooleanField(default=False, help_text='Waiting on at least one incomplete dependency'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', 'is_completed', 'is_blocked'], name='tasks_task_workspa_c3a4df_idx'),
+        ),
+        migrations.AddField(
+            model_name='taskdependency',
+            name='depends_on',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependent_edges', to='tasks.task'),
+        ),
+        migrations.AddField(
+            model_name='taskdependency',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependency_edges', to='tasks.task'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskdependency',
+            constraint=models.UniqueConstraint(fields=('task', 'depends_on'), name='unique_task_dependency'),
+        ),
+    ]
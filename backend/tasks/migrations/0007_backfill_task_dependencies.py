@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+def backfill_dependencies(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskDependency = apps.get_model('tasks', 'TaskDependency')
+
+    tasks = {
+        task_id: (workspace_id, dependencies, is_completed)
+        for task_id, workspace_id, dependencies, is_completed in Task.objects.values_list(
+            'id', 'workspace_id', 'dependencies', 'is_completed'
+        )
+    }
+    edges = []
+    blocked_ids = []
+    for task_id, (workspace_id, dependencies, _) in tasks.items():
+        blocked = False
+        for dep_id in set(dependencies):
+            dependency = tasks.get(dep_id)
+            if dep_id == task_id or dependency is None or dependency[0] != workspace_id:
+                continue
+            edges.append(TaskDependency(task_id=task_id, depends_on_id=dep_id))
+            blocked = blocked or not dependency[2]
+        if blocked:
+            blocked_ids.append(task_id)
+
+    TaskDependency.objects.bulk_create(edges, batch_size=1000, ignore_conflicts=True)
+    Task.objects.filter(id__in=blocked_ids).update(is_blocked=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_taskdependency'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_dependencies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:09
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_backfill_task_dependencies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('estimated_hours', models.FloatField(validators=[django.core.validators.MinValueValidator(0.1)])),
+                ('importance', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)])),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=10)),
+                ('interval', models.PositiveIntegerField(default=1, help_text='Repeat every N days, weeks or months', validators=[django.core.validators.MinValueValidator(1)])),
+                ('start_date', models.DateField(help_text='Due date of the first occurrence')),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('materialized_until', models.DateField(blank=True, help_text='Occurrences due up to this date have been created', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('workspace', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recurring_tasks', to='tasks.workspace')),
+            ],
+            options={
+                'ordering': ['title'],
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='recurrence',
+            field=models.ForeignKey(blank=True, help_text='Rule this task was created from, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='tasks.recurringtask'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('recurrence', 'due_date'), name='unique_recurrence_occurrence'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringtask',
+            index=models.Index(fields=['workspace', 'is_active', 'materialized_until'], name='tasks_recur_workspa_cad5ac_idx'),
+        ),
+    ]
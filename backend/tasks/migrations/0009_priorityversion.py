@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_recurringtask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriorityVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('workspace_key', models.PositiveIntegerField(help_text='Workspace id, 0 for the default workspace', unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
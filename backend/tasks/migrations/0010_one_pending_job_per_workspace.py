@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:26
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def merge_duplicate_pending_jobs(apps, schema_editor):
+    """Fold extra pending jobs of a workspace into its oldest one"""
+    ScoringJob = apps.get_model('tasks', 'ScoringJob')
+    keep = {}
+    for job in ScoringJob.objects.filter(status='pending').order_by('created_at', 'id'):
+        first = keep.setdefault(job.workspace_id, job)
+        if first is job:
+            continue
+        first.request_count += job.request_count
+        first.scoring_date = max(first.scoring_date, job.scoring_date)
+        if job.kind == 'rollover':
+            first.kind = 'rollover'
+        first.save(update_fields=['request_count', 'kind', 'scoring_date'])
+        job.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_priorityversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_pending_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='scoringjob',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('workspace', 0), condition=models.Q(('status', 'pending')), name='one_pending_job_per_workspace'),
+        ),
+    ]
@@ -1,9 +1,79 @@
+import copy
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 
+class Workspace(models.Model):
+    """Partition of tasks; every query, score and cache is scoped to one"""
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=50, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.name
+
+class RecurringTask(models.Model):
+    """
+    Rule for a task that repeats. Occurrences are created as ordinary
+    Tasks by the scoring worker, only as far ahead as the recurrence horizon.
+    """
+    FREQUENCY_DAILY = 'daily'
+    FREQUENCY_WEEKLY = 'weekly'
+    FREQUENCY_MONTHLY = 'monthly'
+    FREQUENCY_CHOICES = [
+        (FREQUENCY_DAILY, 'Daily'),
+        (FREQUENCY_WEEKLY, 'Weekly'),
+        (FREQUENCY_MONTHLY, 'Monthly'),
+    ]
+    
+    workspace = models.ForeignKey(
+        Workspace,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='recurring_tasks'
+    )
+    title = models.CharField(max_length=200)
+    estimated_hours = models.FloatField(validators=[MinValueValidator(0.1)])
+    importance = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(10)]
+    )
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    interval = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text="Repeat every N days, weeks or months"
+    )
+    start_date = models.DateField(help_text="Due date of the first occurrence")
+    end_date = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    materialized_until = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Occurrences due up to this date have been created"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['title']
+        indexes = [
+            models.Index(fields=['workspace', 'is_active', 'materialized_until']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} ({self.get_frequency_display().lower()})"
+
 class Task(models.Model):
+    workspace = models.ForeignKey(
+        Workspace,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='tasks',
+        help_text="Owning workspace; empty for the default shared workspace"
+    )
     title = models.CharField(max_length=200)
     due_date = models.DateField()
     estimated_hours = models.FloatField(
@@ -20,12 +90,68 @@ class Task(models.Model):
         help_text="List of task IDs this task depends on"
     )
     is_completed = models.BooleanField(default=False)
+    is_blocked = models.BooleanField(
+        default=False,
+        help_text="Waiting on at least one incomplete dependency"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     priority_score = models.FloatField(null=True, blank=True)
+    recurrence = models.ForeignKey(
+        RecurringTask,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='occurrences',
+        help_text="Rule this task was created from, if any"
+    )
     
     class Meta:
         ordering = ['-priority_score', 'due_date']
+        indexes = [
+            # Open/completed splits by due date and importance (stats, views),
+            # always within one workspace
+            models.Index(fields=['workspace', 'is_completed', 'due_date']),
+            models.Index(fields=['workspace', 'is_completed', 'importance']),
+            models.Index(fields=['workspace', 'is_completed', 'is_blocked']),
+        ]
+        constraints = [
+            # One occurrence per rule and date, however often expansion runs
+            models.UniqueConstraint(
+                fields=['recurrence', 'due_date'], name='unique_recurrence_occurrence'
+            ),
+        ]
+    
+    # Fields whose changes trigger bookkeeping in signals.py: dependency
+    # edges, completion, and the cached dependency graph (GRAPH_FIELDS)
+    TRACKED_FIELDS = ('title', 'dependencies', 'is_completed', 'workspace_id')
+    GRAPH_FIELDS = ('title', 'dependencies', 'workspace_id')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_fields()
+        return instance
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.remember_tracked_fields()
+    
+    def remember_tracked_fields(self):
+        # Copy so in-place edits of the JSON list still register as changes
+        self._loaded_values = {
+            field: copy.copy(getattr(self, field))
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__
+        }
+    
+    def tracked_field_changed(self, field):
+        loaded = getattr(self, '_loaded_values', {})
+        return field in loaded and loaded[field] != getattr(self, field)
+    
+    def loaded_value(self, field):
+        """A tracked field's value as of the last load or save"""
+        return getattr(self, '_loaded_values', {}).get(field, getattr(self, field))
     
     def __str__(self):
         return self.title
@@ -40,6 +166,22 @@ class Task(models.Model):
         if self.pk and self.pk in self.dependencies:
             raise ValidationError("A task cannot depend on itself")
         
+class TaskDependency(models.Model):
+    """
+    Relational copy of Task.dependencies so dependents of a task can be
+    found with one indexed lookup instead of scanning every JSON list
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='dependency_edges')
+    depends_on = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='dependent_edges')
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'depends_on'], name='unique_task_dependency'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_id} -> {self.depends_on_id}"
+
 class UserPreferences(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     urgency_weight = models.FloatField(default=0.35)
@@ -57,4 +199,78 @@ class UserPreferences(models.Model):
         total = (self.urgency_weight + self.importance_weight + 
                  self.effort_weight + self.dependency_weight)
         if not (0.99 <= total <= 1.01):  # Allow small floating point errors
-            raise ValidationError('Weights must sum to 1.0')
\ No newline at end of file
+            raise ValidationError('Weights must sum to 1.0')
+
+
+class ScoringJob(models.Model):
+    """Queued request to rescore tasks, processed by run_scoring_worker"""
+    KIND_RESCORE = 'rescore'
+    KIND_ROLLOVER = 'rollover'
+    KIND_CHOICES = [
+        (KIND_RESCORE, 'Rescore'),
+        (KIND_ROLLOVER, 'Daily urgency rollover'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    workspace = models.ForeignKey(
+        Workspace, on_delete=models.CASCADE, null=True, blank=True
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=KIND_RESCORE)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    scoring_date = models.DateField(
+        help_text="Date urgency is computed against"
+    )
+    request_count = models.PositiveIntegerField(
+        default=1,
+        help_text="Number of rescore requests coalesced into this job"
+    )
+    tasks_scored = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['workspace', 'scoring_date']),
+        ]
+        constraints = [
+            # Rescores coalesce into a single pending job per workspace;
+            # Coalesce so the default (NULL) workspace is covered as well
+            models.UniqueConstraint(
+                Coalesce('workspace', 0),
+                condition=models.Q(status='pending'),
+                name='one_pending_job_per_workspace',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+
+class PriorityVersion(models.Model):
+    """
+    Per-workspace change counter shared by every process. Bumped after each
+    committed task write; SSE broadcasters poll it so writes made by other
+    ASGI workers or the scoring worker reach their subscribers too.
+    """
+    workspace_key = models.PositiveIntegerField(
+        unique=True,
+        help_text="Workspace id, 0 for the default workspace"
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Workspace {self.workspace_key} v{self.version}"
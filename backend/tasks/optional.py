@@ -0,0 +1,21 @@
+"""
+Optional heavy dependencies, imported on first use.
+
+Modules such as NumPy add tens of milliseconds to every process start,
+including short-lived management commands that never need them, so code
+that can use them asks for them here at call time instead of importing
+them at module level.
+"""
+import importlib
+
+_modules = {}
+
+
+def optional_import(name):
+    """Return the module, or None if it isn't installed; cached either way"""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
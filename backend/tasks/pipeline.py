@@ -0,0 +1,150 @@
+"""
+Streaming scoring pipeline used by the task views and the scoring worker.
+
+Each stage is a generator (or a small sink) so tasks flow through
+fetch -> score -> filter -> rank -> serialize one at a time, and a stage
+only keeps what it needs, e.g. a k-sized heap for the top suggestions.
+"""
+import heapq
+from collections import namedtuple
+
+from .scoring import count_blocked_tasks
+
+DEFAULT_CHUNK_SIZE = 500
+
+QUADRANTS = ('DO_FIRST', 'SCHEDULE', 'DELEGATE', 'ELIMINATE')
+
+ScoredTask = namedtuple(
+    'ScoredTask', ['task', 'score', 'blocked_count', 'breakdown'], defaults=[None]
+)
+
+
+# Sources
+
+def fetch(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream model instances without caching the whole queryset"""
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def blocked_counts(queryset):
+    """One streamed pass over the dependency column, no model instances"""
+    return count_blocked_tasks(
+        queryset.order_by().values_list('dependencies', flat=True).iterator()
+    )
+
+
+# Stages
+
+def score(tasks, scorer, counts):
+    for task in tasks:
+        blocked_count = counts.get(task.id, 0)
+        yield ScoredTask(task, scorer.score_task(task, blocked_count), blocked_count)
+
+
+def explain(tasks, scorer, counts):
+    """Like score, but keeps each task's ScoreBreakdown for its reason"""
+    for task in tasks:
+        blocked_count = counts.get(task.id, 0)
+        breakdown = scorer.explain(task, blocked_count)
+        yield ScoredTask(task, breakdown.score, blocked_count, breakdown)
+
+
+def categorize(tasks, scorer):
+    """Yield (quadrant, urgency, task) for the Eisenhower matrix"""
+    for task in tasks:
+        urgency = scorer.calculate_urgency(task.due_date, task.importance)
+        is_urgent = urgency >= 70
+        is_important = task.importance >= 7
+
+        if is_urgent and is_important:
+            category = 'DO_FIRST'
+        elif not is_urgent and is_important:
+            category = 'SCHEDULE'
+        elif is_urgent and not is_important:
+            category = 'DELEGATE'
+        else:
+            category = 'ELIMINATE'
+        yield category, urgency, task
+
+
+def serialize(tasks, serializer_class):
+    """Serialize one instance at a time with a single reusable serializer"""
+    serializer = serializer_class()
+    for task in tasks:
+        yield serializer.to_representation(task)
+
+
+def paged(queryset, size):
+    """
+    Lists of at most size instances in pk order, one query per page.
+    Each page is read completely before it is handed out, so the caller
+    can write to the table without an open cursor over it.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        page = list(page[:size])
+        if not page:
+            return
+        yield page
+        last_pk = page[-1].pk
+
+
+# Sinks
+
+def top_k(scored, k):
+    """Highest scores first, holding at most k items at a time"""
+    return heapq.nlargest(k, scored, key=lambda item: item.score)
+
+
+def bucket(categorized, serializer_class):
+    """Group categorized tasks into the four Eisenhower quadrants"""
+    matrix = {quadrant: [] for quadrant in QUADRANTS}
+    serializer = serializer_class()
+    for category, urgency, task in categorized:
+        task_data = serializer.to_representation(task)
+        task_data['urgency'] = urgency
+        matrix[category].append(task_data)
+    return matrix
+
+
+# Configurations
+
+def suggestions(queryset, scorer, k=3):
+    """Top k tasks, their reason and components from the same single scoring pass"""
+    counts = blocked_counts(queryset)
+    ranked = top_k(explain(fetch(queryset), scorer, counts), k)
+    return [
+        {
+            'task': item.task,
+            'score': item.score,
+            'reason': item.breakdown.reason(),
+            'components': item.breakdown.as_dict()['components'],
+        }
+        for item in ranked
+    ]
+
+
+def eisenhower_matrix(queryset, scorer, serializer_class):
+    return bucket(categorize(fetch(queryset), scorer), serializer_class)
+
+
+def ranking(queryset, serializer_class):
+    """Serialize an already ordered queryset of persisted scores"""
+    return list(serialize(fetch(queryset), serializer_class))
+
+
+def rescore(queryset, scorer, save_batch, batch_size=DEFAULT_CHUNK_SIZE):
+    """
+    Score every task and hand them to save_batch in fixed-size batches.
+    Pages by pk rather than streaming one cursor, since save_batch writes
+    to the table being read.
+    """
+    counts = blocked_counts(queryset)
+    saved = 0
+    for page in paged(queryset, batch_size):
+        for item in score(page, scorer, counts):
+            item.task.priority_score = item.score
+        saved += save_batch(page)
+    return saved
@@ -0,0 +1,132 @@
+import heapq
+from datetime import date, timedelta
+
+from .scoring import TaskScorer, find_circular_tasks
+
+# Float slack when comparing hours against the remaining daily budget
+EPSILON = 1e-9
+
+
+class PlanGenerator:
+    """
+    Builds a day-by-day work plan on top of TaskScorer.
+    Tasks are released in dependency (topological) order into a priority
+    queue keyed by score; each day is then filled greedily, skipping tasks
+    that don't fit so smaller ready work can use the leftover hours.
+    Tasks longer than a whole day are split across days.
+    Runs in O((V + E) log V) plus a bounded number of skips per day.
+    """
+
+    def __init__(self, scorer=None, hours_per_day=6, horizon_days=5,
+                 start_date=None, max_skips=32):
+        self.start_date = start_date or date.today()
+        self.scorer = scorer or TaskScorer(today=self.start_date)
+        self.hours_per_day = hours_per_day
+        self.horizon_days = horizon_days
+        self.max_skips = max_skips
+
+    def generate(self, tasks):
+        tasks = {task.id: task for task in tasks}
+        scores = self.scorer.score_tasks(tasks.values())
+
+        # Dependencies outside the set (completed or missing) count as done
+        waiting_on = {}
+        dependents = {}
+        for task in tasks.values():
+            pending = {dep_id for dep_id in task.dependencies if dep_id in tasks}
+            waiting_on[task.id] = len(pending)
+            for dep_id in pending:
+                dependents.setdefault(dep_id, []).append(task.id)
+
+        ready = []
+        for task_id, count in waiting_on.items():
+            if count == 0:
+                self._push(ready, tasks[task_id], scores)
+
+        days = []
+        scheduled = set()
+        remaining = {}  # hours left on tasks split across days
+
+        for offset in range(self.horizon_days):
+            capacity = self.hours_per_day
+            entries = []
+            deferred = []
+
+            while capacity > EPSILON and ready:
+                task_id = heapq.heappop(ready)[2]
+                task = tasks[task_id]
+                left = remaining.get(task_id, task.estimated_hours or 0)
+                oversized = left > self.hours_per_day + EPSILON
+
+                # Oversized work may soak up leftover hours, but not ahead of
+                # higher-priority tasks that were already deferred today
+                if left <= capacity + EPSILON or (oversized and not deferred):
+                    hours = min(left, capacity)
+                    capacity -= hours
+                    entries.append(self._entry(task, hours, scores, task_id in remaining))
+
+                    if left - hours > EPSILON:
+                        remaining[task_id] = left - hours
+                        deferred.append(task)
+                        continue
+                    remaining.pop(task_id, None)
+                    scheduled.add(task_id)
+                    for dependent_id in dependents.get(task_id, []):
+                        waiting_on[dependent_id] -= 1
+                        if waiting_on[dependent_id] == 0:
+                            self._push(ready, tasks[dependent_id], scores)
+                else:
+                    # Doesn't fit today; try smaller ready work instead
+                    deferred.append(task)
+                    if len(deferred) >= self.max_skips:
+                        break
+
+            for task in deferred:
+                self._push(ready, task, scores)
+
+            days.append({
+                'date': self.start_date + timedelta(days=offset),
+                'capacity': self.hours_per_day,
+                'hours_planned': round(self.hours_per_day - capacity, 2),
+                'tasks': entries,
+            })
+
+        return {
+            'days': days,
+            'unscheduled': self._unscheduled(tasks, scheduled, waiting_on, scores),
+        }
+
+    def _push(self, heap, task, scores):
+        # Highest score first, then earliest due date
+        heapq.heappush(heap, (-scores[task.id], task.due_date, task.id))
+
+    def _entry(self, task, hours, scores, continued):
+        return {
+            'id': task.id,
+            'title': task.title,
+            'hours': round(hours, 2),
+            'score': scores[task.id],
+            'continued': continued,
+        }
+
+    def _unscheduled(self, tasks, scheduled, waiting_on, scores):
+        leftover = [task_id for task_id in tasks if task_id not in scheduled]
+        blocked = {task_id: tasks[task_id].dependencies
+                   for task_id in leftover if waiting_on[task_id] > 0}
+        circular = find_circular_tasks(blocked) if blocked else set()
+
+        unscheduled = []
+        for task_id in sorted(leftover, key=lambda task_id: -scores[task_id]):
+            if task_id in circular:
+                reason = 'circular_dependency'
+            elif task_id in blocked:
+                reason = 'blocked'
+            else:
+                reason = 'beyond_horizon'
+            unscheduled.append({
+                'id': task_id,
+                'title': tasks[task_id].title,
+                'score': scores[task_id],
+                'reason': reason,
+            })
+        return unscheduled
@@ -0,0 +1,133 @@
+"""
+Lazy expansion of RecurringTask rules into Task occurrences.
+
+A rule is stored once; the scoring worker calls expand_recurrences before
+each rescore, which creates the occurrences due within the recurrence
+horizon in bulk. Occurrences further out don't exist yet, so they are
+neither stored nor scored until they come into range.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+
+from .bulk import apply_bulk_action
+from .graph import invalidate_dependency_graph
+from .models import RecurringTask, Task
+
+
+def occurrence_dates(rule, start, end):
+    """Due dates of rule's occurrences between start and end, inclusive"""
+    start = max(start, rule.start_date)
+    if rule.end_date:
+        end = min(end, rule.end_date)
+    if start > end:
+        return
+
+    if rule.frequency == RecurringTask.FREQUENCY_MONTHLY:
+        first = _month_index(rule.start_date)
+        # Jump straight to the first candidate month instead of walking
+        step = -(-(_month_index(start) - first) // rule.interval)
+        while True:
+            due = _add_months(rule.start_date, step * rule.interval)
+            if due > end:
+                return
+            if due >= start:
+                yield due
+            step += 1
+    else:
+        days = rule.interval * (7 if rule.frequency == RecurringTask.FREQUENCY_WEEKLY else 1)
+        step = -(-(start - rule.start_date).days // days)
+        due = rule.start_date + timedelta(days=step * days)
+        while due <= end:
+            yield due
+            due += timedelta(days=days)
+
+
+def _month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+def _add_months(day, months):
+    """Same day of month, clamped to the month's length (Jan 31 -> Feb 28)"""
+    year, month = divmod(_month_index(day) + months, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def expand_recurrences(workspace_id=None, today=None, horizon_days=None):
+    """
+    Create the missing occurrences of a workspace's active rules that are
+    due up to today + horizon_days, with one bulk insert.
+    A new rule starts at today; after that each run continues from where
+    the previous one stopped, so occurrences missed while no worker ran
+    still appear (overdue). Returns the number of tasks created.
+    """
+    today = today or date.today()
+    if horizon_days is None:
+        horizon_days = settings.RECURRENCE_HORIZON_DAYS
+    until = today + timedelta(days=horizon_days)
+
+    rules = list(
+        RecurringTask.objects.filter(
+            workspace_id=workspace_id, is_active=True, start_date__lte=until
+        )
+        .filter(Q(materialized_until__isnull=True) | Q(materialized_until__lt=until))
+        # Skip rules that ended before what was already created
+        .exclude(end_date__lte=F('materialized_until'))
+    )
+    if not rules:
+        return 0
+
+    starts = {
+        rule.id: rule.materialized_until + timedelta(days=1) if rule.materialized_until else today
+        for rule in rules
+    }
+    # Occurrences kept from before a rule was rewound, e.g. completed ones
+    existing = set(
+        Task.objects.filter(
+            recurrence__in=rules, due_date__gte=min(starts.values()), due_date__lte=until
+        ).values_list('recurrence_id', 'due_date')
+    )
+
+    occurrences = []
+    for rule in rules:
+        occurrences.extend(
+            Task(
+                workspace_id=rule.workspace_id,
+                recurrence=rule,
+                title=rule.title,
+                due_date=due,
+                estimated_hours=rule.estimated_hours,
+                importance=rule.importance,
+            )
+            for due in occurrence_dates(rule, starts[rule.id], until)
+            if (rule.id, due) not in existing
+        )
+
+    with transaction.atomic():
+        # The unique (recurrence, due_date) constraint guards concurrent workers
+        Task.objects.bulk_create(occurrences, batch_size=500, ignore_conflicts=True)
+        RecurringTask.objects.filter(id__in=[rule.id for rule in rules]).update(
+            materialized_until=until
+        )
+
+    if occurrences:
+        transaction.on_commit(lambda: invalidate_dependency_graph(workspace_id))
+    return len(occurrences)
+
+
+def discard_future_occurrences(rule, today=None):
+    """
+    Delete rule's open occurrences due from today on and rewind it, so the
+    next expansion recreates them from the rule as it is now.
+    Completed and overdue occurrences are kept.
+    """
+    today = today or date.today()
+    upcoming = Task.objects.filter(recurrence=rule, is_completed=False, due_date__gte=today)
+    if upcoming.exists():
+        apply_bulk_action(upcoming, 'delete', workspace_id=rule.workspace_id)
+    RecurringTask.objects.filter(pk=rule.pk).update(materialized_until=None)
+    rule.materialized_until = None
@@ -1,3 +1,4 @@
+from collections import namedtuple
 from datetime import date, timedelta
 
 def has_circular_dependency(task_id, dependencies_map, visited=None, path=None):
@@ -27,9 +28,233 @@ def has_circular_dependency(task_id, dependencies_map, visited=None, path=None):
     path.remove(task_id)
     return False
 
+def find_circular_tasks(dependencies_map):
+    """
+    Return the set of task ids for which has_circular_dependency is True,
+    i.e. tasks that sit on a cycle or depend (transitively) on one.
+    Uses one iterative Tarjan SCC pass, so the whole graph costs O(V + E)
+    instead of a separate DFS per task.
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    reaches_cycle = {}
+    counter = 0
+
+    for root in dependencies_map:
+        if root in index:
+            continue
+        work = [(root, iter(dependencies_map.get(root, [])))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, deps = work[-1]
+            advanced = False
+            for dep_id in deps:
+                if dep_id not in index:
+                    index[dep_id] = lowlink[dep_id] = counter
+                    counter += 1
+                    stack.append(dep_id)
+                    on_stack.add(dep_id)
+                    work.append((dep_id, iter(dependencies_map.get(dep_id, []))))
+                    advanced = True
+                    break
+                if dep_id in on_stack:
+                    lowlink[node] = min(lowlink[node], index[dep_id])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index[node]:
+                # SCCs come out dependencies-first, so every dependency
+                # outside this component is already resolved
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                members = set(component)
+                cyclic = len(component) > 1 or node in dependencies_map.get(node, [])
+                if not cyclic:
+                    cyclic = any(
+                        reaches_cycle.get(dep_id, False)
+                        for member in component
+                        for dep_id in dependencies_map.get(member, [])
+                        if dep_id not in members
+                    )
+                for member in component:
+                    reaches_cycle[member] = cyclic
+
+    return {task_id for task_id, cyclic in reaches_cycle.items() if cyclic}
+
+class DependencyIndex:
+    """
+    Adjacency index {task_id: [dependency ids]} that loads on demand.
+    loader(ids) returns {task_id: dependencies} for the requested ids; it is
+    called once per BFS level, so a check only reads the part of the graph
+    reachable from the edges being added.
+    """
+    def __init__(self, loader, adjacency=None):
+        self.loader = loader
+        self.adjacency = dict(adjacency or {})
+
+    def _load(self, task_ids):
+        missing = [task_id for task_id in task_ids if task_id not in self.adjacency]
+        if missing:
+            loaded = self.loader(missing)
+            for task_id in missing:
+                self.adjacency[task_id] = list(loaded.get(task_id, []))
+
+    def would_create_cycle(self, task_id, new_dependencies):
+        """
+        Check whether making task_id depend on new_dependencies closes a cycle,
+        i.e. whether task_id is reachable from any of the new dependencies.
+        """
+        frontier = set(new_dependencies)
+        seen = set()
+        while frontier:
+            if task_id in frontier:
+                return True
+            seen |= frontier
+            self._load(frontier)
+            frontier = {
+                dep_id
+                for node in frontier
+                for dep_id in self.adjacency[node]
+                if dep_id not in seen
+            }
+        return False
+
+def count_blocked_tasks(dependency_lists):
+    """
+    Count how many tasks depend on each task id.
+    Takes an iterable of dependency lists (one per task) and returns
+    {task_id: blocked_count} built in a single pass over the edges.
+    """
+    counts = {}
+    for dependencies in dependency_lists:
+        for dep_id in set(dependencies):
+            counts[dep_id] = counts.get(dep_id, 0) + 1
+    return counts
+
+def urgency_for_days(days_until_due, importance=5):
+    """Urgency (0-100) for a task due in days_until_due days"""
+    # Overdue tasks
+    if days_until_due < 0:
+        if importance >= 8:
+            return 100
+        if importance >= 5:
+            return 90
+        return 80
+    
+    # Due today
+    if days_until_due == 0:
+        return 95
+    
+    # Due within a week
+    if days_until_due <= 7:
+        return 90 - (days_until_due * 10)
+    
+    # Due within a month
+    if days_until_due <= 30:
+        return max(20, 60 - (days_until_due - 7) * 2)
+    
+    # Far future
+    return max(0, 20 - (days_until_due - 30) * 0.5)
+
+# Far-future urgency decays to 0 at this many days out and stays there
+URGENCY_HORIZON_DAYS = 70
+
+# Precomputed urgency so scoring a task is an array lookup:
+# URGENCY_BY_DAYS[days_until_due] and OVERDUE_URGENCY[importance]
+URGENCY_BY_DAYS = tuple(urgency_for_days(days) for days in range(URGENCY_HORIZON_DAYS + 1))
+OVERDUE_URGENCY = {importance: urgency_for_days(-1, importance) for importance in range(11)}
+
+ScoreComponent = namedtuple('ScoreComponent', ['name', 'value', 'weight', 'contribution'])
+
+
+class ScoreBreakdown:
+    """
+    Every component of one task's priority score: its 0-100 value, weight
+    and weighted contribution. Built once per task by TaskScorer.explain,
+    so the score and the reason for it come from the same computation.
+    """
+    
+    def __init__(self, task, blocked_count, components):
+        self.task_id = task.id
+        self.importance = task.importance
+        self.estimated_hours = task.estimated_hours
+        self.blocked_count = blocked_count
+        self.components = components
+        self.score = round(sum(c.contribution for c in components), 2)
+    
+    def component(self, name):
+        for component in self.components:
+            if component.name == name:
+                return component
+        raise KeyError(name)
+    
+    def reason(self):
+        """Human-readable explanation"""
+        reasons = []
+        
+        urgency = self.component('urgency').value
+        if urgency >= 95:
+            reasons.append("due today or overdue")
+        elif urgency >= 70:
+            reasons.append("due soon")
+        
+        if self.importance >= 8:
+            reasons.append("high importance")
+        
+        if self.estimated_hours <= 1:
+            reasons.append("quick win")
+        
+        if self.blocked_count > 0:
+            reasons.append(f"blocks {self.blocked_count} other task(s)")
+        
+        return " - ".join(reasons) if reasons else "good overall priority"
+    
+    def as_dict(self):
+        return {
+            'task_id': self.task_id,
+            'score': self.score,
+            'reason': self.reason(),
+            'blocked_count': self.blocked_count,
+            'components': [
+                {
+                    'name': c.name,
+                    'value': c.value,
+                    'weight': c.weight,
+                    'contribution': round(c.contribution, 2),
+                }
+                for c in self.components
+            ],
+        }
+
+
 class TaskScorer:
+    """
+    Weighted priority scoring. All date arithmetic is done against `today`,
+    fixed when the scorer is created, so one scorer per request (or job)
+    gives consistent results even across midnight.
+    """
+    COMPONENTS = ('urgency', 'importance', 'effort', 'dependency')
+    
     def __init__(self, urgency_weight=0.35, importance_weight=0.30,
-                 effort_weight=0.20, dependency_weight=0.15):
+                 effort_weight=0.20, dependency_weight=0.15, today=None):
+        self.today = today or date.today()
+        self.today_ordinal = self.today.toordinal()
         self.urgency_weight = urgency_weight
         self.importance_weight = importance_weight
         self.effort_weight = effort_weight
@@ -37,14 +262,20 @@ class TaskScorer:
     
     def calculate_priority_score(self, task, all_tasks):
         """Calculate overall priority score (0-100)"""
-        due_date = task.due_date or (date.today() + timedelta(days=7))
-        importance = task.importance or 5
-        estimated_hours = task.estimated_hours or 2
-
-        urgency = self.calculate_urgency(due_date, importance)
-        importance = self.calculate_importance(importance)
-        effort = self.calculate_effort_score(estimated_hours)
-        dependency = self.calculate_dependency_score(task, all_tasks)
+        blocked_count = sum(1 for t in all_tasks if task.id in t.dependencies)
+        return self.score_task(task, blocked_count)
+    
+    def score_tasks(self, tasks):
+        """Score a batch of tasks in one pass, returns {task_id: score}"""
+        blocked_counts = count_blocked_tasks(t.dependencies for t in tasks)
+        return {
+            task.id: self.score_task(task, blocked_counts.get(task.id, 0))
+            for task in tasks
+        }
+    
+    def score_task(self, task, blocked_count):
+        """Priority score (0-100) given how many tasks this one blocks"""
+        urgency, importance, effort, dependency = self.component_values(task, blocked_count)
         
         score = (
             urgency * self.urgency_weight +
@@ -55,36 +286,44 @@ class TaskScorer:
         
         return round(score, 2)
     
+    def component_values(self, task, blocked_count):
+        """(urgency, importance, effort, dependency) values, each 0-100"""
+        due_date = task.due_date or (self.today + timedelta(days=7))
+        importance = task.importance or 5
+        estimated_hours = task.estimated_hours or 2
+        
+        return (
+            self.calculate_urgency(due_date, importance),
+            self.calculate_importance(importance),
+            self.calculate_effort_score(estimated_hours),
+            self.score_blocked_count(blocked_count),
+        )
+    
+    def explain(self, task, blocked_count):
+        """ScoreBreakdown for a task; its score equals score_task's"""
+        values = self.component_values(task, blocked_count)
+        weights = (
+            self.urgency_weight, self.importance_weight,
+            self.effort_weight, self.dependency_weight,
+        )
+        return ScoreBreakdown(task, blocked_count, tuple(
+            ScoreComponent(name, value, weight, value * weight)
+            for name, value, weight in zip(self.COMPONENTS, values, weights)
+        ))
+    
     def calculate_urgency(self, due_date, importance=5):
         """Calculate urgency based on due date (0-100)"""
         if not due_date:
             return 20  # Default for tasks without due date
         
-        today = date.today()
-        days_until_due = (due_date - today).days
+        days_until_due = due_date.toordinal() - self.today_ordinal
         
-        # Overdue tasks
         if days_until_due < 0:
-            if importance >= 8:
-                return 100
-            if importance >= 5:
-                return 90
-            return 80
-        
-        # Due today
-        if days_until_due == 0:
-            return 95
-        
-        # Due within a week
-        if days_until_due <= 7:
-            return 90 - (days_until_due * 10)
-        
-        # Due within a month
-        if days_until_due <= 30:
-            return max(20, 60 - (days_until_due - 7) * 2)
-        
-        # Far future
-        return max(0, 20 - (days_until_due - 30) * 0.5)
+            urgency = OVERDUE_URGENCY.get(importance)
+            return urgency if urgency is not None else urgency_for_days(days_until_due, importance)
+        if days_until_due < len(URGENCY_BY_DAYS):
+            return URGENCY_BY_DAYS[days_until_due]
+        return 0
     
     def calculate_importance(self, importance_rating):
         """Convert 1-10 importance to 0-100 scale"""
@@ -104,7 +343,10 @@ class TaskScorer:
             1 for t in all_tasks 
             if task.id in t.dependencies
         )
-        
+        return self.score_blocked_count(blocked_count)
+    
+    def score_blocked_count(self, blocked_count):
+        """Map the number of blocked tasks to a dependency score (0-100)"""
         if blocked_count == 0:
             return 0
         elif blocked_count == 1:
@@ -116,26 +358,13 @@ class TaskScorer:
     
     def generate_suggestion_reason(self, task, all_tasks):
         """Generate human-readable explanation"""
-        reasons = []
-        
-        urgency = self.calculate_urgency(task.due_date, task.importance)
-        if urgency >= 95:
-            reasons.append("due today or overdue")
-        elif urgency >= 70:
-            reasons.append("due soon")
-        
-        if task.importance >= 8:
-            reasons.append("high importance")
-        
-        if task.estimated_hours <= 1:
-            reasons.append("quick win")
-        
         blocked_count = sum(1 for t in all_tasks if task.id in t.dependencies)
-        if blocked_count > 0:
-            reasons.append(f"blocks {blocked_count} other task(s)")
-        
-        return " - ".join(reasons) if reasons else "good overall priority"
-        
+        return self.suggestion_reason(task, blocked_count)
+    
+    def suggestion_reason(self, task, blocked_count):
+        """Explanation given how many tasks this one blocks"""
+        return self.explain(task, blocked_count).reason()
+    
     def categorize_task(self, task):
         """Eisenhower Matrix categorization"""
         urgency = self.calculate_urgency(task.due_date)
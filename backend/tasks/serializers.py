@@ -1,33 +1,64 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from .models import Task
+from .bulk import ACTIONS
+from .models import RecurringTask, Task
+from .scoring import DependencyIndex
 
-def validate_dependencies(self, value):
-    """Ensure dependencies exist"""
-    if value:
-        existing_ids = Task.objects.filter(id__in=value).values_list('id', flat=True)
-        if len(existing_ids) != len(value):
-            raise serializers.ValidationError("Some dependency IDs don't exist")
-        
-        # Check for circular dependencies (only on update)
-        if self.instance:  # If updating existing task
-            all_tasks = Task.objects.all()
-            try:
-                validate_dependencies(self.instance.id, value, all_tasks)
-            except Exception as e:
-                raise serializers.ValidationError(str(e))
-            
-    return value
+def load_dependencies(task_ids):
+    """Fetch {task_id: dependencies} for a batch of tasks"""
+    return dict(
+        Task.objects.filter(id__in=task_ids).order_by().values_list('id', 'dependencies')
+    )
 
 class TaskSerializer(serializers.ModelSerializer):
     priority_score = serializers.FloatField(read_only=True)
+    is_blocked = serializers.BooleanField(read_only=True)
+    recurrence = serializers.PrimaryKeyRelatedField(read_only=True)
     
     class Meta:
         model = Task
         fields = [
             'id', 'title', 'due_date', 'estimated_hours',
-            'importance', 'dependencies', 'is_completed',
-            'priority_score', 'created_at', 'updated_at'
+            'importance', 'dependencies', 'is_completed', 'is_blocked',
+            'priority_score', 'recurrence', 'created_at', 'updated_at'
         ]
+    
+    def validate_dependencies(self, value):
+        """Ensure dependencies exist and don't create a cycle"""
+        if not isinstance(value, list) or any(
+            isinstance(dep_id, bool) or not isinstance(dep_id, int) for dep_id in value
+        ):
+            raise serializers.ValidationError("Dependencies must be a list of task IDs")
+        if not value:
+            return value
+        
+        # One query both checks existence and seeds the adjacency index;
+        # dependencies must live in the same workspace as the task
+        workspace = self.context.get('workspace')
+        rows = dict(
+            Task.objects.filter(id__in=set(value), workspace=workspace)
+            .order_by().values_list('id', 'dependencies')
+        )
+        missing = set(value) - rows.keys()
+        if missing:
+            raise serializers.ValidationError(
+                f"Some dependency IDs don't exist: {sorted(missing)}"
+            )
+        
+        # A new task has no dependents yet, so only updates can close a cycle
+        if self.instance:
+            if self.instance.id in value:
+                raise serializers.ValidationError("A task cannot depend on itself")
+            
+            # Existing edges were checked when they were written
+            added = set(value) - set(self.instance.dependencies)
+            index = DependencyIndex(load_dependencies, rows)
+            if index.would_create_cycle(self.instance.id, added):
+                raise serializers.ValidationError(
+                    "These dependencies would create a circular dependency"
+                )
+        
+        return value
 
 class TaskAnalysisSerializer(serializers.Serializer):
     """For analyze endpoint"""
@@ -37,4 +68,70 @@ class TaskSuggestionSerializer(serializers.Serializer):
     """For suggest endpoint"""
     task = TaskSerializer()
     reason = serializers.CharField()
-    score = serializers.FloatField()
\ No newline at end of file
+    score = serializers.FloatField()
+    components = serializers.ListField(child=serializers.DictField(), required=False)
+
+class BulkActionSerializer(serializers.Serializer):
+    """
+    For bulk endpoint
+    Tasks are picked either by ids or by a filter of allowed lookups
+    """
+    FILTERS = (
+        'is_completed', 'is_blocked', 'importance', 'importance__gte',
+        'importance__lte', 'due_date__lt', 'due_date__lte', 'due_date__gte',
+        'title__icontains',
+    )
+    
+    action = serializers.ChoiceField(choices=ACTIONS)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+    # An empty filter would match the whole workspace
+    filter = serializers.DictField(required=False, allow_empty=False)
+    importance = serializers.IntegerField(min_value=1, max_value=10, required=False)
+    due_date = serializers.DateField(required=False)
+    
+    def validate_filter(self, value):
+        lookups = {}
+        for lookup, raw in value.items():
+            if lookup not in self.FILTERS:
+                raise serializers.ValidationError(
+                    f"Unsupported filter '{lookup}', use one of: {', '.join(self.FILTERS)}"
+                )
+            field = Task._meta.get_field(lookup.split('__')[0])
+            try:
+                lookups[lookup] = field.to_python(raw)
+            except DjangoValidationError:
+                raise serializers.ValidationError(f"Invalid value for '{lookup}'")
+        return lookups
+    
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Provide exactly one of 'ids' or 'filter'")
+        if data['action'] == 'reprioritize' and not ('importance' in data or 'due_date' in data):
+            raise serializers.ValidationError("reprioritize needs 'importance' and/or 'due_date'")
+        return data
+    
+    def changes(self):
+        """Field updates for reprioritize"""
+        return {
+            field: self.validated_data[field]
+            for field in ('importance', 'due_date') if field in self.validated_data
+        }
+
+class RecurringTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RecurringTask
+        fields = [
+            'id', 'title', 'estimated_hours', 'importance', 'frequency',
+            'interval', 'start_date', 'end_date', 'is_active',
+            'materialized_until', 'created_at'
+        ]
+        read_only_fields = ['materialized_until', 'created_at']
+    
+    def validate(self, data):
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': "Must not be before start_date"})
+        return data
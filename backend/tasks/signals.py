@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .dependencies import (
+    neighbours, refresh_blocked, rescore, resolve_completion, sync_dependency_edges,
+)
+from .events import notify_priority_change
+from .graph import invalidate_dependency_graph
+from .models import Task, TaskDependency
+from .scoring import TaskScorer
+
+_suspended = ContextVar('task_signals_suspended', default=False)
+
+
+@contextmanager
+def bulk_changes():
+    """
+    Skip the per-row receivers below; the caller does the bookkeeping
+    once for the whole batch (see tasks/bulk.py)
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def _invalidate_graph_on_commit(workspace_ids):
+    for workspace_id in workspace_ids:
+        transaction.on_commit(
+            lambda workspace_id=workspace_id: invalidate_dependency_graph(workspace_id)
+        )
+
+
+@receiver(post_save, sender=Task)
+def track_dependencies(sender, instance, created, update_fields, raw, **kwargs):
+    """
+    Keep dependency edges, blocked status, neighbour scores and the cached
+    dependency graph current
+    """
+    if _suspended.get():
+        return
+    if raw:
+        # Fixtures skip the bookkeeping, but the graph must not go stale
+        _invalidate_graph_on_commit({instance.workspace_id})
+        return
+    if update_fields is not None:
+        changed = {Task._meta.get_field(name).attname for name in update_fields}
+        if not changed & set(Task.TRACKED_FIELDS):
+            return
+    
+    if created or any(instance.tracked_field_changed(field) for field in Task.GRAPH_FIELDS):
+        # A task moved to another workspace leaves the old graph too
+        _invalidate_graph_on_commit({instance.workspace_id, instance.loaded_value('workspace_id')})
+    
+    if created or instance.tracked_field_changed('dependencies'):
+        sync_dependency_edges(instance)
+        blocked = TaskDependency.objects.filter(
+            task=instance, depends_on__is_completed=False
+        ).exists()
+        if blocked != instance.is_blocked:
+            Task.objects.filter(pk=instance.pk).update(is_blocked=blocked)
+            instance.is_blocked = blocked
+    
+    if instance.tracked_field_changed('is_completed'):
+        # One scorer, and so one date, for everything this save rescores
+        resolve_completion([instance.id], TaskScorer())
+    
+    instance.remember_tracked_fields()
+
+
+@receiver(pre_delete, sender=Task)
+def remember_neighbours(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    # Edges cascade away with the task, so look them up first
+    instance._neighbours = neighbours([instance.id])
+
+
+@receiver(post_delete, sender=Task)
+def release_neighbours(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    dependent_ids, dependency_ids = getattr(instance, '_neighbours', (set(), set()))
+    refresh_blocked(dependent_ids)
+    rescore(dependency_ids)
+    _invalidate_graph_on_commit({instance.workspace_id})
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def push_priority_changes(sender, instance, **kwargs):
+    """Let the workspace's SSE subscribers know once the write is committed"""
+    if _suspended.get():
+        return
+    workspace_id = instance.workspace_id
+    transaction.on_commit(lambda: notify_priority_change(workspace_id))
@@ -0,0 +1,229 @@
+"""
+Columnar binary snapshot of a workspace's tasks.
+
+The file is a fixed header followed by one fixed-width array per column
+(id, due date, importance, completion, hours) and the dependency graph in
+CSR form: dep_offsets[row]..dep_offsets[row + 1] slices dep_index, which
+holds row numbers rather than task ids. Readers mmap the file and view
+each column in place, so opening a snapshot costs no parsing and every
+process reading the same file shares its pages.
+
+    python manage.py export_snapshot tasks.snap --workspace acme
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from datetime import date
+
+from .optional import optional_import
+
+MAGIC = b'TASKSNAP'
+VERSION = 1
+
+# magic, version, workspace id (-1 = default), exported on, tasks, edges
+HEADER = struct.Struct('<8sHxxqi4xQQ')
+
+# (name, array typecode, length) in file order; lengths use n tasks, m edges
+COLUMNS = (
+    ('ids', 'q', lambda n, m: n),
+    ('due_ordinal', 'i', lambda n, m: n),
+    ('importance', 'b', lambda n, m: n),
+    ('is_completed', 'B', lambda n, m: n),
+    ('estimated_hours', 'd', lambda n, m: n),
+    ('dep_offsets', 'q', lambda n, m: n + 1),
+    ('dep_index', 'i', lambda n, m: m),
+)
+
+ALIGNMENT = 8
+
+SnapshotTask = namedtuple(
+    'SnapshotTask',
+    ['id', 'due_date', 'importance', 'estimated_hours', 'is_completed', 'dependencies'],
+)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _padding(size):
+    return -size % ALIGNMENT
+
+
+def _check_byteorder():
+    # Columns are stored little-endian and viewed without conversion
+    if sys.byteorder != 'little':
+        raise SnapshotError("Task snapshots require a little-endian platform")
+
+
+def export_snapshot(queryset, path, workspace_id=None, exported_on=None):
+    """
+    Write the tasks in queryset to path, returns (tasks, edges) written.
+    One streamed pass over the table; dependency ids are turned into row
+    numbers afterwards and ids outside the snapshot are dropped. The file
+    is written next to path and renamed over it, so processes that have
+    the previous snapshot mapped keep reading a consistent copy.
+    """
+    _check_byteorder()
+    exported_on = exported_on or date.today()
+    columns = {name: array(typecode) for name, typecode, _ in COLUMNS}
+    dependency_ids = array('q')
+    raw_offsets = array('q', [0])
+
+    rows = (
+        queryset.order_by('id')
+        .values_list('id', 'due_date', 'importance', 'estimated_hours',
+                     'is_completed', 'dependencies')
+        .iterator()
+    )
+    for task_id, due_date, importance, hours, is_completed, dependencies in rows:
+        columns['ids'].append(task_id)
+        columns['due_ordinal'].append(due_date.toordinal() if due_date else 0)
+        columns['importance'].append(importance or 0)
+        columns['estimated_hours'].append(hours or 0.0)
+        columns['is_completed'].append(1 if is_completed else 0)
+        dependency_ids.extend(dict.fromkeys(dependencies))
+        raw_offsets.append(len(dependency_ids))
+
+    row_of = {task_id: row for row, task_id in enumerate(columns['ids'])}
+    dep_offsets = columns['dep_offsets']
+    dep_index = columns['dep_index']
+    dep_offsets.append(0)
+    for row in range(len(columns['ids'])):
+        for dep_id in dependency_ids[raw_offsets[row]:raw_offsets[row + 1]]:
+            dep_row = row_of.get(dep_id)
+            if dep_row is not None and dep_row != row:
+                dep_index.append(dep_row)
+        dep_offsets.append(len(dep_index))
+
+    task_count, edge_count = len(columns['ids']), len(dep_index)
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        -1 if workspace_id is None else workspace_id,
+        exported_on.toordinal(), task_count, edge_count,
+    )
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(b'\0' * _padding(len(header)))
+        for name, _, _ in COLUMNS:
+            data = columns[name].tobytes()
+            f.write(data)
+            f.write(b'\0' * _padding(len(data)))
+    os.replace(tmp_path, path)
+    return task_count, edge_count
+
+
+class TaskSnapshot:
+    """
+    Read-only view of a snapshot file.
+    Each column is a memoryview over the mapped file, indexed by row.
+    """
+
+    def __init__(self, path):
+        _check_byteorder()
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        if len(self._buffer) < HEADER.size:
+            self.close()
+            raise SnapshotError(f"{path} is not a task snapshot")
+        magic, version, workspace_id, exported_on, n, m = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SnapshotError(f"{path} is not a version {VERSION} task snapshot")
+
+        self.workspace_id = None if workspace_id == -1 else workspace_id
+        self.exported_on = date.fromordinal(exported_on)
+        self._columns = {}
+
+        offset = HEADER.size + _padding(HEADER.size)
+        for name, typecode, length in COLUMNS:
+            size = length(n, m) * struct.calcsize(typecode)
+            if offset + size > len(self._buffer):
+                self.close()
+                raise SnapshotError(f"{path} is truncated")
+            self._columns[name] = (typecode, offset, length(n, m))
+            setattr(self, name, self._buffer[offset:offset + size].cast(typecode))
+            offset += size + _padding(size)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Views must be released before the map can be closed
+        for name, _, _ in COLUMNS:
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def dependency_rows(self, row):
+        return self.dep_index[self.dep_offsets[row]:self.dep_offsets[row + 1]]
+
+    def task(self, row):
+        """The task at row, shaped like a Task for TaskScorer"""
+        due_ordinal = self.due_ordinal[row]
+        return SnapshotTask(
+            id=self.ids[row],
+            due_date=date.fromordinal(due_ordinal) if due_ordinal else None,
+            importance=self.importance[row],
+            estimated_hours=self.estimated_hours[row],
+            is_completed=bool(self.is_completed[row]),
+            dependencies=[self.ids[dep_row] for dep_row in self.dependency_rows(row)],
+        )
+
+    def dependency_map(self):
+        """{task_id: [dependency ids]}, the input to find_circular_tasks"""
+        ids = self.ids
+        return {
+            ids[row]: [ids[dep_row] for dep_row in self.dependency_rows(row)]
+            for row in range(len(ids))
+        }
+
+    def blocked_counts(self):
+        """Per row, how many open tasks depend on it"""
+        counts = [0] * len(self)
+        offsets, dep_index, completed = self.dep_offsets, self.dep_index, self.is_completed
+        for row in range(len(counts)):
+            if completed[row]:
+                continue
+            for dep_row in dep_index[offsets[row]:offsets[row + 1]]:
+                counts[dep_row] += 1
+        return counts
+
+    def score_tasks(self, scorer):
+        """{task_id: score} for the open tasks, without touching the database"""
+        counts = self.blocked_counts()
+        return {
+            self.ids[row]: scorer.score_task(self.task(row), counts[row])
+            for row in range(len(self))
+            if not self.is_completed[row]
+        }
+
+    def as_numpy(self):
+        """
+        The columns as NumPy arrays sharing the mapped pages,
+        or None if NumPy isn't installed. Drop the arrays before close().
+        """
+        numpy = optional_import('numpy')
+        if numpy is None:
+            return None
+        dtypes = {'q': '<i8', 'i': '<i4', 'b': 'i1', 'B': 'u1', 'd': '<f8'}
+        return {
+            name: numpy.frombuffer(self._mmap, dtype=dtypes[typecode],
+                                   count=count, offset=offset)
+            for name, (typecode, offset, count) in self._columns.items()
+        }
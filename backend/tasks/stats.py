@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+from django.db.models import Case, CharField, Count, Q, Sum, Value, When
+
+from .pipeline import QUADRANTS
+
+# calculate_urgency reaches the "urgent" threshold (70) for tasks that are
+# overdue or due within this many days; the Eisenhower view uses the same cut.
+URGENT_WITHIN_DAYS = 2
+IMPORTANT_FROM = 7
+
+DUE_BUCKETS = ('overdue', 'today', 'this_week', 'this_month', 'later')
+
+
+def task_stats(queryset, today=None):
+    """
+    Aggregate counts and hours for a task queryset entirely in SQL.
+    Runs a fixed number of grouped queries regardless of table size.
+    """
+    today = today or date.today()
+    open_tasks = queryset.filter(is_completed=False).order_by()
+
+    totals = queryset.order_by().aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_completed=True)),
+        overdue=Count('id', filter=Q(is_completed=False, due_date__lt=today)),
+        open_hours=Sum('estimated_hours', filter=Q(is_completed=False)),
+    )
+
+    by_importance = {
+        row['importance']: row['count']
+        for row in queryset.order_by().values('importance').annotate(count=Count('id'))
+    }
+
+    due_bucket = Case(
+        When(due_date__lt=today, then=Value('overdue')),
+        When(due_date=today, then=Value('today')),
+        When(due_date__lte=today + timedelta(days=7), then=Value('this_week')),
+        When(due_date__lte=today + timedelta(days=30), then=Value('this_month')),
+        default=Value('later'),
+        output_field=CharField(),
+    )
+    hours_by_due = {bucket: 0 for bucket in DUE_BUCKETS}
+    for row in open_tasks.annotate(bucket=due_bucket).values('bucket').annotate(
+        hours=Sum('estimated_hours')
+    ):
+        hours_by_due[row['bucket']] = row['hours']
+
+    urgent = Q(due_date__lte=today + timedelta(days=URGENT_WITHIN_DAYS))
+    important = Q(importance__gte=IMPORTANT_FROM)
+    quadrant = Case(
+        When(urgent & important, then=Value('DO_FIRST')),
+        When(important, then=Value('SCHEDULE')),
+        When(urgent, then=Value('DELEGATE')),
+        default=Value('ELIMINATE'),
+        output_field=CharField(),
+    )
+    quadrants = {name: 0 for name in QUADRANTS}
+    for row in open_tasks.annotate(quadrant=quadrant).values('quadrant').annotate(
+        count=Count('id')
+    ):
+        quadrants[row['quadrant']] = row['count']
+
+    total = totals['total']
+    return {
+        'total': total,
+        'completed': totals['completed'],
+        'open': total - totals['completed'],
+        'completion_rate': round(totals['completed'] / total, 4) if total else 0.0,
+        'overdue': totals['overdue'],
+        'open_hours': totals['open_hours'] or 0,
+        'by_importance': {
+            importance: by_importance.get(importance, 0) for importance in range(1, 11)
+        },
+        'hours_by_due_date': hours_by_due,
+        'quadrants': quadrants,
+    }
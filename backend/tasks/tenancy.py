@@ -0,0 +1,27 @@
+from django.http import Http404
+
+from .models import Task, Workspace
+
+WORKSPACE_HEADER = 'X-Workspace'
+WORKSPACE_PARAM = 'workspace'
+
+
+def resolve_workspace(request):
+    """
+    Workspace selected by the X-Workspace header or ?workspace= slug.
+    Returns None for the default workspace (tasks without one).
+    The query parameter exists for clients like EventSource that can't
+    set headers.
+    """
+    slug = request.headers.get(WORKSPACE_HEADER) or request.GET.get(WORKSPACE_PARAM)
+    if not slug:
+        return None
+    try:
+        return Workspace.objects.get(slug=slug)
+    except Workspace.DoesNotExist:
+        raise Http404(f"Unknown workspace '{slug}'")
+
+
+def workspace_tasks(workspace_id):
+    """All tasks in one workspace partition"""
+    return Task.objects.filter(workspace_id=workspace_id)
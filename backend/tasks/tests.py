@@ -1,7 +1,50 @@
-from django.test import TestCase
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+import os
+import tempfile
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import resolve
+from django.utils import timezone
 from datetime import date, timedelta
-from .models import Task
-from .scoring import TaskScorer, has_circular_dependency
+from unittest.mock import patch
+from task_analyzer.sqlite_tuning import PRAGMAS, database_options
+from task_analyzer.startup import preload
+from . import pipeline
+from .models import RecurringTask, Task, ScoringJob, TaskDependency, Workspace
+from .scoring import TaskScorer, has_circular_dependency, find_circular_tasks, urgency_for_days
+from .serializers import TaskSerializer
+from .bulk import apply_bulk_action
+from .graph import GRAPH_CACHE_ALIAS
+from .optional import optional_import
+from .planning import PlanGenerator
+from .recurrence import expand_recurrences, occurrence_dates
+from .loadtest import LoadTestError, parse_mix, percentile, run_load_test, summarize
+from .snapshot import SnapshotError, TaskSnapshot, export_snapshot
+from .events import (
+    PriorityBroadcaster, build_priority_snapshot, bump_priority_version, read_priority_version,
+)
+from .worker import (
+    claim_next_job, enqueue_rescore, ensure_daily_rollover, rescore_tasks, run_job,
+    run_pending_jobs, scoring_status,
+)
+
+
+def make_task(title, hours=2, importance=5, dependencies=None, days=3, **fields):
+    """Create a task due in `days` days"""
+    return Task.objects.create(
+        title=title,
+        due_date=date.today() + timedelta(days=days),
+        estimated_hours=hours,
+        importance=importance,
+        dependencies=dependencies or [],
+        **fields
+    )
 
 
 class TaskScorerTestCase(TestCase):
@@ -237,6 +280,75 @@ class TaskScorerTestCase(TestCase):
         
         print("✅ All effort and dependency tests passed!")
 
+    
+    def test_injected_clock_and_urgency_tables(self):
+        """
+        Scoring against an injected date should be reproducible, and the
+        precomputed urgency tables should match the urgency formula
+        """
+        print("\n=== Test 4: Clock Injection and Urgency Lookup ===")
+        
+        fixed_day = date(2025, 1, 15)
+        scorer = TaskScorer(today=fixed_day)
+        
+        for days in range(-5, 100):
+            for importance in range(1, 11):
+                self.assertEqual(
+                    scorer.calculate_urgency(fixed_day + timedelta(days=days), importance),
+                    urgency_for_days(days, importance),
+                    f"Lookup differs from formula at {days} days, importance {importance}"
+                )
+        
+        # Same task, same injected date: same score regardless of the real date
+        task = self.important_not_urgent_task
+        task.due_date = fixed_day + timedelta(days=3)
+        first = scorer.score_task(task, 0)
+        later = TaskScorer(today=fixed_day).score_task(task, 0)
+        next_day = TaskScorer(today=fixed_day + timedelta(days=1)).score_task(task, 0)
+        print(f"Score on {fixed_day}: {first}, next day: {next_day}")
+        
+        self.assertEqual(first, later)
+        self.assertGreater(next_day, first, "A day closer to the deadline should be more urgent")
+        
+        print("✅ Clock injection and urgency lookup passed!")
+    
+    def test_score_breakdown_and_explain_endpoint(self):
+        """
+        The breakdown should add up to the same score as score_task and
+        back both the explain endpoint and the suggestion reasons
+        """
+        print("\n=== Test 5: Score Breakdown ===")
+        
+        blocker = self.urgent_important_task
+        Task.objects.create(
+            title="Waits on blocker", due_date=date.today() + timedelta(days=20),
+            estimated_hours=3, importance=4, dependencies=[blocker.id]
+        )
+        
+        breakdown = self.scorer.explain(blocker, 1)
+        self.assertEqual(breakdown.score, self.scorer.score_task(blocker, 1))
+        self.assertEqual(
+            [c.name for c in breakdown.components],
+            ['urgency', 'importance', 'effort', 'dependency']
+        )
+        self.assertEqual(breakdown.component('dependency').value, 30)
+        self.assertEqual(breakdown.reason(), self.scorer.suggestion_reason(blocker, 1))
+        
+        response = self.client.get(f'/api/tasks/{blocker.id}/explain/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        print(f"Explain: {data}")
+        self.assertEqual(data['blocked_count'], 1, "Blocked count comes from the edge table")
+        self.assertEqual(data['score'], breakdown.score)
+        self.assertIn("blocks 1 other task(s)", data['reason'])
+        
+        suggestions = self.client.get('/api/tasks/suggest/').json()['suggestions']
+        top = next(s for s in suggestions if s['task']['id'] == blocker.id)
+        self.assertEqual(top['reason'], data['reason'])
+        self.assertEqual(len(top['components']), 4)
+        
+        print("✅ Score breakdown passed!")
+
 
 class CircularDependencyTestCase(TestCase):
     """Test cases for circular dependency detection"""
@@ -296,6 +408,9 @@ class CircularDependencyTestCase(TestCase):
         self.assertTrue(has_cycle_b, "Circular dependency should be detected for Task B")
         self.assertTrue(has_cycle_c, "Circular dependency should be detected for Task C")
         
+        # The single-pass detector should agree with the per-task DFS
+        self.assertEqual(find_circular_tasks(dep_map), {task_a.id, task_b.id, task_c.id})
+        
         # Test a task without circular dependency
         task_d = Task.objects.create(
             title="Task D - Independent",
@@ -312,4 +427,952 @@ class CircularDependencyTestCase(TestCase):
         
         self.assertFalse(has_cycle_d, "Independent task should not have circular dependency")
         
-        print("✅ Circular dependency detection passed!")
\ No newline at end of file
+        print("✅ Circular dependency detection passed!")
+    
+    def test_serializer_rejects_new_cycle(self):
+        """
+        Updating a task with a dependency that leads back to it should fail
+        validation, while acyclic updates are accepted
+        """
+        print("\n=== Bonus Test: Cycle Validation on Write ===")
+        
+        task_a = Task.objects.create(
+            title="Task A", due_date=date.today(), estimated_hours=1,
+            importance=5, dependencies=[]
+        )
+        task_b = Task.objects.create(
+            title="Task B", due_date=date.today(), estimated_hours=1,
+            importance=5, dependencies=[task_a.id]
+        )
+        task_c = Task.objects.create(
+            title="Task C", due_date=date.today(), estimated_hours=1,
+            importance=5, dependencies=[task_b.id]
+        )
+        
+        # A -> C would close A <- B <- C
+        serializer = TaskSerializer(task_a, data={'dependencies': [task_c.id]}, partial=True)
+        self.assertFalse(serializer.is_valid(), "Cycle should be rejected")
+        print(f"Cycle errors: {serializer.errors}")
+        
+        serializer = TaskSerializer(task_a, data={'dependencies': [task_a.id]}, partial=True)
+        self.assertFalse(serializer.is_valid(), "Self dependency should be rejected")
+        
+        serializer = TaskSerializer(task_a, data={'dependencies': [999999]}, partial=True)
+        self.assertFalse(serializer.is_valid(), "Unknown dependency should be rejected")
+        
+        # C -> A adds a shortcut, not a cycle; the existence query already
+        # loads everything the reachability check needs
+        serializer = TaskSerializer(task_c, data={'dependencies': [task_b.id, task_a.id]}, partial=True)
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        
+        print("✅ Cycle validation on write passed!")
+
+
+class PriorityBroadcasterTestCase(TestCase):
+    """Test cases for the SSE priority fan-out"""
+    
+    async def test_change_is_computed_once_and_fanned_out(self):
+        """
+        A burst of task writes should produce one snapshot computation
+        whose frames reach every subscriber
+        """
+        print("\n=== SSE Test: Fan-out of priority changes ===")
+        
+        broadcaster = PriorityBroadcaster(debounce=0)
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        
+        for title in ["Write report", "Review PR"]:
+            await Task.objects.acreate(
+                title=title,
+                due_date=date.today() + timedelta(days=1),
+                estimated_hours=1,
+                importance=8,
+                dependencies=[]
+            )
+        
+        with patch('tasks.events.build_priority_snapshot',
+                   wraps=build_priority_snapshot) as build:
+            broadcaster.notify()
+            broadcaster.notify()
+            await asyncio.sleep(0)
+            await broadcaster._publisher
+        
+        self.assertEqual(build.call_count, 1, "Snapshot should be built once per event")
+        
+        first_frames = [first.get_nowait() for _ in range(first.qsize())]
+        second_frames = [second.get_nowait() for _ in range(second.qsize())]
+        print(f"Frames pushed: {first_frames}")
+        
+        self.assertEqual(first_frames, second_frames, "Every subscriber should get the same frames")
+        self.assertTrue(first_frames[0].startswith("event: scores"))
+        self.assertTrue(first_frames[1].startswith("event: suggestions"))
+        
+        print("✅ SSE fan-out passed!")
+    
+    async def test_changes_from_other_processes_are_picked_up(self):
+        """
+        A write recorded only in the shared version counter, as one made by
+        another process would be, should still reach the subscribers
+        """
+        print("\n=== SSE Test: Cross-process changes ===")
+        
+        broadcaster = PriorityBroadcaster(debounce=0, poll_interval=0.01)
+        queue = broadcaster.subscribe()
+        await asyncio.sleep(0.05)  # let the watcher read the baseline version
+        
+        await Task.objects.acreate(
+            title="Written by the scoring worker",
+            due_date=date.today(),
+            estimated_hours=1,
+            importance=9,
+            dependencies=[]
+        )
+        await sync_to_async(bump_priority_version)()
+        self.assertEqual(await sync_to_async(read_priority_version)(), 1)
+        
+        frame = await asyncio.wait_for(queue.get(), 2)
+        print(f"Frame pushed: {frame}")
+        self.assertTrue(frame.startswith("event: scores"))
+        
+        broadcaster.unsubscribe(queue)
+        self.assertIsNone(broadcaster._watcher, "Polling stops with the last subscriber")
+        await broadcaster._publisher
+        
+        print("✅ Cross-process changes passed!")
+    
+    async def test_resubscribe_after_remote_change_gets_fresh_snapshot(self):
+        """
+        A change made elsewhere while nobody was subscribed must show up in
+        the next client's snapshot, and later changes must still follow it
+        """
+        print("\n=== SSE Test: Resubscribe After Remote Change ===")
+        
+        broadcaster = PriorityBroadcaster(debounce=0, poll_interval=0.01)
+        
+        async def create_remotely(title):
+            task = await Task.objects.acreate(
+                title=title,
+                due_date=date.today(),
+                estimated_hours=1,
+                importance=7,
+                dependencies=[]
+            )
+            await sync_to_async(bump_priority_version)()
+            return task
+        
+        first = broadcaster.stream()
+        self.assertTrue((await first.__anext__()).startswith("event: snapshot"))
+        await first.aclose()
+        
+        offline = await create_remotely("Written while nobody listened")
+        
+        second = broadcaster.stream()
+        snapshot = json.loads((await second.__anext__()).split("data: ", 1)[1])
+        print(f"Snapshot on reconnect: {snapshot['scores']}")
+        self.assertIn(str(offline.id), snapshot['scores'])
+        
+        online = await create_remotely("Written after reconnecting")
+        frame = await asyncio.wait_for(second.__anext__(), 2)
+        self.assertTrue(frame.startswith("event: scores"))
+        self.assertIn(str(online.id), json.loads(frame.split("data: ", 1)[1])['changed'])
+        await second.aclose()
+        
+        print("✅ Resubscribe after remote change passed!")
+
+
+class ScoringWorkerTestCase(TestCase):
+    """Test cases for the background rescoring queue"""
+    
+    def test_rescores_are_coalesced_and_persisted(self):
+        """
+        Repeated rescore requests should collapse into one pending job,
+        and running it should persist scores and report a fresh ranking
+        """
+        print("\n=== Worker Test: Coalesced Rescoring ===")
+        
+        task = Task.objects.create(
+            title="Prepare release notes",
+            due_date=date.today(),
+            estimated_hours=1,
+            importance=8,
+            dependencies=[]
+        )
+        
+        first = enqueue_rescore()
+        second = enqueue_rescore()
+        
+        self.assertEqual(first.pk, second.pk, "Pending rescores should be coalesced")
+        self.assertEqual(ScoringJob.objects.count(), 1)
+        self.assertEqual(scoring_status()['state'], 'queued')
+        
+        processed = run_pending_jobs(batch_size=1)
+        task.refresh_from_db()
+        job = ScoringJob.objects.get()
+        print(f"Job: {job}, request count: {job.request_count}, score: {task.priority_score}")
+        
+        self.assertEqual(processed, 1)
+        self.assertEqual(job.request_count, 2)
+        self.assertEqual(job.status, ScoringJob.STATUS_DONE)
+        self.assertEqual(task.priority_score, TaskScorer().score_tasks([task])[task.id])
+        self.assertEqual(scoring_status()['state'], 'fresh')
+        
+        # The rollover for today is already covered by the finished job
+        self.assertEqual(ensure_daily_rollover(), [])
+        
+        print("✅ Coalesced rescoring passed!")
+    
+    def test_abandoned_running_job_is_reclaimed(self):
+        """
+        A job left running by a crashed worker should stop counting as
+        active once its lease expires, and its work should be queued again
+        """
+        print("\n=== Worker Test: Lease Expiry ===")
+        
+        Task.objects.create(
+            title="Nightly export",
+            due_date=date.today(),
+            estimated_hours=1,
+            importance=5,
+            dependencies=[]
+        )
+        enqueue_rescore(kind=ScoringJob.KIND_ROLLOVER)
+        crashed = claim_next_job()
+        self.assertEqual(scoring_status()['state'], 'running')
+        
+        ScoringJob.objects.filter(pk=crashed.pk).update(
+            started_at=timezone.now() - timedelta(seconds=settings.SCORING_JOB_LEASE_SECONDS + 1)
+        )
+        self.assertEqual(scoring_status()['state'], 'stale', "An expired lease isn't running")
+        
+        requeued = ensure_daily_rollover()
+        crashed.refresh_from_db()
+        print(f"Crashed job: {crashed} ({crashed.error}), requeued: {requeued}")
+        self.assertEqual(crashed.status, ScoringJob.STATUS_FAILED)
+        self.assertEqual(scoring_status()['state'], 'queued')
+        self.assertEqual(ScoringJob.objects.filter(status=ScoringJob.STATUS_PENDING).count(), 1)
+        
+        # The original worker finishing late must not overwrite the reclaim
+        run_job(crashed)
+        crashed.refresh_from_db()
+        self.assertEqual(crashed.status, ScoringJob.STATUS_FAILED)
+        
+        self.assertEqual(run_pending_jobs(), 1)
+        self.assertEqual(scoring_status()['state'], 'fresh')
+        
+        print("✅ Lease expiry passed!")
+
+
+class ConcurrentEnqueueTestCase(TransactionTestCase):
+    """Test cases for rescore requests racing each other"""
+    
+    def test_concurrent_enqueues_share_one_job(self):
+        """
+        Requests enqueuing at the same moment from separate connections
+        should all succeed and end up counted on a single pending job
+        """
+        print("\n=== Worker Test: Concurrent Enqueue ===")
+        
+        workers = 8
+        barrier = threading.Barrier(workers)
+        errors = []
+        
+        def enqueue():
+            try:
+                barrier.wait()
+                enqueue_rescore()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+        
+        threads = [threading.Thread(target=enqueue) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        jobs = list(ScoringJob.objects.all())
+        print(f"Errors: {errors}, jobs: {[(job.status, job.request_count) for job in jobs]}")
+        self.assertEqual(errors, [])
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].request_count, workers)
+        
+        print("✅ Concurrent enqueue passed!")
+
+
+class DependencyGraphCacheTestCase(TestCase):
+    """Test cases for the cached dependency_graph endpoint"""
+    
+    def setUp(self):
+        caches[GRAPH_CACHE_ALIAS].clear()
+        self.task = Task.objects.create(
+            title="Design schema",
+            due_date=date.today() + timedelta(days=3),
+            estimated_hours=2,
+            importance=7,
+            dependencies=[]
+        )
+    
+    def test_graph_is_cached_until_a_graph_write(self):
+        """
+        Repeated reads should be served from cache; title and dependency
+        changes, from the API or any other save, should invalidate it once
+        committed, score changes should not
+        """
+        print("\n=== Cache Test: Dependency Graph ===")
+        
+        url = '/api/tasks/dependency_graph/'
+        first = self.client.get(url).json()
+        with self.assertNumQueries(0):
+            cached = self.client.get(url).json()
+        self.assertEqual(first, cached)
+        
+        # Importance is not part of the graph, the cache stays valid
+        self.client.patch(f'/api/tasks/{self.task.id}/', {'importance': 9}, content_type='application/json')
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/tasks/{self.task.id}/', {'title': "Design DB schema"}, content_type='application/json')
+        updated = self.client.get(url).json()
+        print(f"Graph after rename: {updated}")
+        self.assertEqual(updated['nodes'][0]['title'], "Design DB schema")
+        
+        # Saves outside the API (shell, data fixes) invalidate through the signals
+        with self.captureOnCommitCallbacks(execute=True):
+            api = make_task("Build API", dependencies=[self.task.id])
+        self.assertEqual(len(self.client.get(url).json()['edges']), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            api.dependencies = []
+            api.save()
+        self.assertEqual(self.client.get(url).json()['edges'], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            api.delete()
+        self.assertEqual(len(self.client.get(url).json()['nodes']), 1)
+        
+        # A per-process cache can miss other processes' invalidations, so it must expire
+        cache = caches[GRAPH_CACHE_ALIAS]
+        if 'LocMemCache' in type(cache).__name__:
+            self.assertIsNotNone(cache.default_timeout)
+        
+        print("✅ Dependency graph caching passed!")
+
+
+class SQLiteProfileTestCase(SimpleTestCase):
+    """Test cases for the opt-in SQLite performance profile"""
+    
+    # Opens its own scratch database rather than the test database
+    databases = {'default'}
+    
+    def test_pragmas_applied_on_connect(self):
+        """
+        A connection opened with the profile's OPTIONS should run in WAL mode
+        with the tuned synchronous level and busy timeout
+        """
+        print("\n=== SQLite Test: Performance Profile ===")
+        
+        with tempfile.TemporaryDirectory() as scratch:
+            handler = ConnectionHandler({
+                'default': {
+                    'ENGINE': 'django.db.backends.sqlite3',
+                    'NAME': os.path.join(scratch, 'profile.sqlite3'),
+                    'OPTIONS': database_options(),
+                }
+            })
+            connection = handler['default']
+            try:
+                with connection.cursor() as cursor:
+                    pragmas = {
+                        name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'busy_timeout')
+                    }
+            finally:
+                connection.close()
+        
+        print(f"Pragmas: {pragmas}")
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['synchronous'], 1, "synchronous should be NORMAL")
+        self.assertEqual(pragmas['busy_timeout'], PRAGMAS['busy_timeout'])
+        
+        print("✅ SQLite performance profile passed!")
+
+
+class PlanGeneratorTestCase(TestCase):
+    """Test cases for the capacity-aware plan generator"""
+    
+    def test_plan_respects_dependencies_and_capacity(self):
+        """
+        Dependents must be planned after their dependencies, no day may
+        exceed its budget, and cyclic tasks must be reported unscheduled
+        """
+        print("\n=== Plan Test: Daily Work Plan ===")
+        
+        api = make_task("Build API", 3, importance=6)
+        ui = make_task("Build UI", 2, importance=10, dependencies=[api.id])
+        small = make_task("Reply to email", 0.5, importance=4)
+        big = make_task("Migrate data", 10, importance=7)
+        loop_a = make_task("Loop A", 1)
+        loop_b = make_task("Loop B", 1, dependencies=[loop_a.id])
+        loop_a.dependencies = [loop_b.id]
+        loop_a.save()
+        
+        plan = PlanGenerator(hours_per_day=4, horizon_days=5).generate(
+            Task.objects.filter(is_completed=False)
+        )
+        
+        order = []
+        for day in plan['days']:
+            print(f"{day['date']}: {[(e['title'], e['hours']) for e in day['tasks']]}")
+            self.assertLessEqual(day['hours_planned'], 4, "Day budget exceeded")
+            order.extend(entry['id'] for entry in day['tasks'] if entry['id'] not in order)
+        
+        self.assertLess(order.index(api.id), order.index(ui.id), "Dependency must come first")
+        self.assertIn(small.id, order)
+        big_hours = sum(
+            entry['hours'] for day in plan['days'] for entry in day['tasks'] if entry['id'] == big.id
+        )
+        self.assertEqual(big_hours, 10, "Oversized task should be split across days")
+        
+        reasons = {item['id']: item['reason'] for item in plan['unscheduled']}
+        print(f"Unscheduled: {plan['unscheduled']}")
+        self.assertEqual(reasons[loop_a.id], 'circular_dependency')
+        self.assertEqual(reasons[loop_b.id], 'circular_dependency')
+        
+        response = self.client.get('/api/tasks/plan/', {'hours_per_day': 4, 'days': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/tasks/plan/', {'days': 0}).status_code, 400)
+        
+        print("✅ Daily work plan passed!")
+
+
+class ScoringPipelineTestCase(TestCase):
+    """Test cases for the streaming scoring pipeline"""
+    
+    def test_pipeline_matches_full_scoring(self):
+        """
+        Top-k suggestions and matrix buckets from the streaming pipeline
+        should match scoring the fully loaded task list
+        """
+        print("\n=== Pipeline Test: Streaming Suggestions ===")
+        
+        blocker = Task.objects.create(
+            title="Set up CI", due_date=date.today() + timedelta(days=10),
+            estimated_hours=3, importance=6, dependencies=[]
+        )
+        for i in range(8):
+            Task.objects.create(
+                title=f"Feature {i}",
+                due_date=date.today() + timedelta(days=i * 4),
+                estimated_hours=1 + i,
+                importance=1 + i,
+                dependencies=[blocker.id] if i % 3 == 0 else []
+            )
+        
+        scorer = TaskScorer()
+        tasks = Task.objects.filter(is_completed=False)
+        all_tasks = list(tasks)
+        expected = sorted(
+            all_tasks,
+            key=lambda t: scorer.calculate_priority_score(t, all_tasks),
+            reverse=True
+        )[:3]
+        
+        top_3 = pipeline.suggestions(tasks, scorer, k=3)
+        print(f"Suggestions: {[(s['task'].title, s['score'], s['reason']) for s in top_3]}")
+        
+        self.assertEqual([s['task'].id for s in top_3], [t.id for t in expected])
+        for suggestion in top_3:
+            self.assertEqual(
+                suggestion['reason'],
+                scorer.generate_suggestion_reason(suggestion['task'], all_tasks)
+            )
+        
+        matrix = pipeline.eisenhower_matrix(tasks, scorer, TaskSerializer)
+        self.assertEqual(sum(len(matrix[q]) for q in pipeline.QUADRANTS), len(all_tasks))
+        
+        print("✅ Streaming pipeline passed!")
+
+
+class TaskStatsTestCase(TestCase):
+    """Test cases for the SQL-aggregated stats endpoint"""
+    
+    def test_stats_match_python_categorization(self):
+        """
+        Aggregated counts and quadrants should agree with scoring tasks in
+        Python, using a constant number of queries
+        """
+        print("\n=== Stats Test: Aggregate Statistics ===")
+        
+        for offset, importance, done in [(-3, 9, False), (0, 8, False), (1, 3, False),
+                                         (2, 7, False), (5, 9, False), (20, 2, False),
+                                         (45, 6, False), (3, 5, True)]:
+            Task.objects.create(
+                title=f"Task due in {offset} days",
+                due_date=date.today() + timedelta(days=offset),
+                estimated_hours=2,
+                importance=importance,
+                dependencies=[],
+                is_completed=done
+            )
+        
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/tasks/stats/')
+        stats = response.json()
+        print(f"Stats: {stats}")
+        
+        self.assertEqual(stats['total'], 8)
+        self.assertEqual(stats['completed'], 1)
+        self.assertEqual(stats['completion_rate'], 0.125)
+        self.assertEqual(stats['overdue'], 1)
+        self.assertEqual(stats['by_importance']['9'], 2)
+        self.assertEqual(stats['hours_by_due_date'], {
+            'overdue': 2, 'today': 2, 'this_week': 6, 'this_month': 2, 'later': 2
+        })
+        
+        matrix = pipeline.eisenhower_matrix(
+            Task.objects.filter(is_completed=False), TaskScorer(), TaskSerializer
+        )
+        self.assertEqual(stats['quadrants'], {q: len(matrix[q]) for q in pipeline.QUADRANTS})
+        
+        print("✅ Aggregate statistics passed!")
+
+
+class WorkspaceScopingTestCase(TestCase):
+    """Test cases for per-workspace task partitioning"""
+    
+    def setUp(self):
+        caches[GRAPH_CACHE_ALIAS].clear()
+        self.alpha = Workspace.objects.create(name="Alpha", slug="alpha")
+        self.beta = Workspace.objects.create(name="Beta", slug="beta")
+        self.alpha_task = Task.objects.create(
+            workspace=self.alpha, title="Alpha launch", due_date=date.today(),
+            estimated_hours=2, importance=9, dependencies=[]
+        )
+        self.beta_task = Task.objects.create(
+            workspace=self.beta, title="Beta cleanup", due_date=date.today(),
+            estimated_hours=1, importance=3, dependencies=[]
+        )
+    
+    def test_requests_only_see_their_workspace(self):
+        """
+        Listing, scoring, stats, graphs and dependency validation should all
+        be limited to the workspace named in the X-Workspace header
+        """
+        print("\n=== Tenancy Test: Workspace Scoping ===")
+        
+        alpha = {'HTTP_X_WORKSPACE': 'alpha'}
+        
+        listed = self.client.get('/api/tasks/', **alpha).json()
+        self.assertEqual([t['id'] for t in listed], [self.alpha_task.id])
+        
+        beta_job = enqueue_rescore(self.beta.id)
+        analyzed = self.client.post('/api/tasks/analyze/', **alpha).json()
+        self.assertEqual([t['id'] for t in analyzed['tasks']], [self.alpha_task.id])
+        self.beta_task.refresh_from_db()
+        self.assertIsNone(self.beta_task.priority_score, "Other workspaces must not be rescored")
+        beta_job.refresh_from_db()
+        self.assertEqual(beta_job.status, ScoringJob.STATUS_PENDING, "Inline scoring only drains the caller's jobs")
+        
+        self.assertEqual(self.client.get('/api/tasks/stats/', **alpha).json()['total'], 1)
+        graph = self.client.get('/api/tasks/dependency_graph/', **alpha).json()
+        self.assertEqual([n['id'] for n in graph['nodes']], [self.alpha_task.id])
+        
+        # Tasks from another workspace can't be read or depended on
+        response = self.client.get(f'/api/tasks/{self.beta_task.id}/', **alpha)
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/tasks/', {
+            'title': "Cross-workspace", 'due_date': str(date.today()),
+            'estimated_hours': 1, 'importance': 5, 'dependencies': [self.beta_task.id]
+        }, content_type='application/json', **alpha)
+        self.assertEqual(response.status_code, 400)
+        
+        created = self.client.post('/api/tasks/', {
+            'title': "Alpha follow-up", 'due_date': str(date.today()),
+            'estimated_hours': 1, 'importance': 5, 'dependencies': [self.alpha_task.id]
+        }, content_type='application/json', **alpha)
+        self.assertEqual(Task.objects.get(id=created.json()['id']).workspace, self.alpha)
+        
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_X_WORKSPACE='nope').status_code, 404)
+        
+        print("✅ Workspace scoping passed!")
+
+
+class CompletionResolutionTestCase(TestCase):
+    """Test cases for completion-aware dependency bookkeeping"""
+    
+    def test_completing_a_task_releases_its_dependents(self):
+        """
+        Completing a dependency should unblock its dependents, lower the
+        score of what it depended on, and show up in the ready list
+        """
+        print("\n=== Completion Test: Dependency Resolution ===")
+        
+        schema = make_task("Design schema", importance=6, days=4)
+        api = make_task("Build API", importance=6, dependencies=[schema.id], days=4)
+        docs = make_task("Write docs", importance=6, dependencies=[api.id], days=4)
+        self.assertEqual(TaskDependency.objects.count(), 2)
+        
+        api.refresh_from_db()
+        self.assertTrue(api.is_blocked, "API waits on the schema")
+        
+        self.client.post('/api/tasks/analyze/')
+        schema.refresh_from_db()
+        score_while_blocking = schema.priority_score
+        
+        ready = self.client.get('/api/tasks/ready/').json()
+        self.assertEqual([t['id'] for t in ready], [schema.id])
+        
+        response = self.client.patch(
+            f'/api/tasks/{api.id}/', {'is_completed': True}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        
+        docs.refresh_from_db()
+        schema.refresh_from_db()
+        print(f"Docs blocked: {docs.is_blocked}, schema score: {score_while_blocking} -> {schema.priority_score}")
+        
+        self.assertFalse(docs.is_blocked, "Docs should be ready once the API is done")
+        self.assertLess(schema.priority_score, score_while_blocking, "Schema no longer blocks an open task")
+        
+        ready = self.client.get('/api/tasks/ready/').json()
+        self.assertEqual({t['id'] for t in ready}, {schema.id, docs.id})
+        
+        # Reopening blocks again; deleting releases whatever waited on it
+        api.refresh_from_db()
+        api.is_completed = False
+        api.save()
+        docs.refresh_from_db()
+        self.assertTrue(docs.is_blocked)
+        api.delete()
+        docs.refresh_from_db()
+        self.assertFalse(docs.is_blocked)
+        
+        print("✅ Dependency resolution passed!")
+
+
+class BulkActionTestCase(TestCase):
+    """Test cases for the bulk actions endpoint"""
+    
+    def bulk(self, body):
+        return self.client.post('/api/tasks/bulk/', body, content_type='application/json')
+    
+    def test_bulk_actions_keep_dependencies_consistent(self):
+        """
+        Complete, reprioritize and delete many tasks in one request each,
+        with blocked status, edges and scores updated for the whole batch
+        """
+        print("\n=== Bulk Test: Complete, Reprioritize, Delete ===")
+        
+        base = make_task("Base", importance=3)
+        chores = [make_task(f"Chore {i}", importance=2) for i in range(3)]
+        feature = make_task("Feature", importance=8, dependencies=[base.id, chores[0].id])
+        
+        response = self.bulk({'action': 'reprioritize', 'filter': {'importance__lte': 2}, 'importance': 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['matched'], 3)
+        self.assertEqual(Task.objects.filter(importance=4).count(), 3)
+        self.assertTrue(all(
+            task.priority_score is not None for task in Task.objects.filter(importance=4)
+        ))
+        
+        before = Task.objects.get(id=base.id).updated_at
+        response = self.bulk({'action': 'complete', 'ids': [base.id, chores[0].id]})
+        self.assertGreater(Task.objects.get(id=base.id).updated_at, before, "updated_at is refreshed")
+        self.assertEqual(response.json()['matched'], 2)
+        self.assertIn(feature.id, response.json()['rescored'])
+        feature.refresh_from_db()
+        self.assertFalse(feature.is_blocked, "Both dependencies are done")
+        
+        response = self.bulk({'action': 'delete', 'filter': {'is_completed': True}})
+        print(f"Delete response: {response.json()}")
+        self.assertEqual(response.json()['matched'], 2)
+        feature.refresh_from_db()
+        self.assertEqual(feature.dependencies, [], "Deleted ids are dropped from dependency lists")
+        self.assertEqual(TaskDependency.objects.count(), 0)
+        self.assertEqual(Task.objects.count(), 3)
+        
+        # Bad requests are rejected before anything is touched
+        self.assertEqual(self.bulk({'action': 'delete'}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'delete', 'filter': {}}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'delete', 'ids': []}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'delete', 'filter': {'id__gt': 0}}).status_code, 400)
+        self.assertEqual(self.bulk({'action': 'reprioritize', 'ids': [feature.id]}).status_code, 400)
+        self.assertEqual(Task.objects.count(), 3)
+        
+        print("✅ Bulk actions passed!")
+    
+    def test_bulk_complete_rescores_with_the_given_scorer(self):
+        """
+        Completing in bulk should rescore the neighbours with the caller's
+        scorer, so the whole request is scored against one date
+        """
+        print("\n=== Bulk Test: Request Scorer ===")
+        
+        base = make_task("Base", importance=5)
+        feature = make_task("Feature", importance=8, dependencies=[base.id])
+        later = TaskScorer(today=date.today() + timedelta(days=30))
+        
+        apply_bulk_action(Task.objects.filter(id=base.id), 'complete', scorer=later)
+        feature.refresh_from_db()
+        print(f"Feature score: {feature.priority_score}")
+        self.assertEqual(feature.priority_score, later.score_task(feature, 0))
+        self.assertNotEqual(feature.priority_score, TaskScorer().score_task(feature, 0))
+        
+        print("✅ Request scorer passed!")
+
+
+class TaskSnapshotTestCase(TestCase):
+    """Test cases for the memory-mapped columnar snapshot"""
+    
+    def test_snapshot_round_trip(self):
+        """
+        An exported snapshot should map back to the same columns, graph
+        and scores as the database, and reject files that aren't snapshots
+        """
+        print("\n=== Snapshot Test: Export and Map ===")
+        
+        today = date.today()
+        base = Task.objects.create(
+            title="Base", due_date=today + timedelta(days=2),
+            estimated_hours=1.5, importance=9, dependencies=[]
+        )
+        loop_a = Task.objects.create(
+            title="Loop A", due_date=today - timedelta(days=1),
+            estimated_hours=3, importance=4, dependencies=[base.id]
+        )
+        loop_b = Task.objects.create(
+            title="Loop B", due_date=today + timedelta(days=10),
+            estimated_hours=8, importance=6, dependencies=[loop_a.id, 999]
+        )
+        Task.objects.filter(pk=loop_a.pk).update(dependencies=[base.id, loop_b.id])
+        done = Task.objects.create(
+            title="Done", due_date=today, estimated_hours=1,
+            importance=5, dependencies=[base.id], is_completed=True
+        )
+        
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, 'tasks.snap')
+            tasks, edges = export_snapshot(Task.objects.all(), path, exported_on=today)
+            self.assertEqual((tasks, edges), (4, 4), "Unknown dependency 999 is dropped")
+            
+            with self.assertNumQueries(0), TaskSnapshot(path) as snapshot:
+                print(f"Snapshot: {len(snapshot)} tasks, {os.path.getsize(path)} bytes")
+                self.assertEqual(snapshot.ids.tolist(), [base.id, loop_a.id, loop_b.id, done.id])
+                self.assertEqual(snapshot.exported_on, today)
+                self.assertEqual(snapshot.importance.tolist(), [9, 4, 6, 5])
+                self.assertEqual(snapshot.estimated_hours[0], 1.5)
+                self.assertEqual(snapshot.blocked_counts(), [1, 1, 1, 0])
+                
+                dependency_map = snapshot.dependency_map()
+                self.assertEqual(find_circular_tasks(dependency_map), {loop_a.id, loop_b.id})
+                
+                scorer = TaskScorer(today=today)
+                scores = snapshot.score_tasks(scorer)
+            
+            expected = scorer.score_tasks(Task.objects.filter(is_completed=False))
+            self.assertEqual(scores, expected, "Warm-start scores match the database")
+            
+            with open(path, 'r+b') as f:
+                f.write(b'NOTASNAP')
+            with self.assertRaises(SnapshotError):
+                TaskSnapshot(path)
+        
+        print("✅ Snapshot round trip passed!")
+
+
+class LoadTestHelpersTestCase(SimpleTestCase):
+    """Test cases for the load-test request mix and latency statistics"""
+    
+    def test_mix_and_percentiles(self):
+        """
+        Mixes should normalize to weights that sum to 1 and reject unknown
+        endpoints; percentiles use the nearest-rank method
+        """
+        print("\n=== Load Test: Mix and Percentiles ===")
+        
+        mix = parse_mix("suggest=3, analyze")
+        self.assertEqual(mix, {'suggest': 0.75, 'analyze': 0.25})
+        self.assertEqual(parse_mix("plan=2,stats=0"), {'plan': 1.0})
+        for bad in ("unknown=1", "suggest=fast", "suggest=-1", "stats=0", ""):
+            with self.assertRaises(ValueError, msg=bad):
+                parse_mix(bad)
+        
+        latencies = list(range(1, 101))
+        self.assertEqual(
+            [percentile(latencies, pct) for pct in (50, 95, 99, 100)], [50, 95, 99, 100]
+        )
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+        
+        report = summarize({'suggest': [(0.010, True), (0.030, False)]}, elapsed=2.0)
+        print(f"Summary: {report}")
+        self.assertEqual(report['suggest']['requests'], 2)
+        self.assertEqual(report['suggest']['errors'], 1)
+        self.assertEqual(report['suggest']['throughput_rps'], 1.0)
+        self.assertEqual(report['suggest']['p99_ms'], 30.0)
+        
+        print("✅ Load test helpers passed!")
+
+
+class LoadTestWorkspaceTestCase(TestCase):
+    """Test cases for which workspace the load test seeds and drops"""
+    
+    async def _no_load(self, *args, **kwargs):
+        return {}, 1.0
+    
+    def _run(self, slug, **kwargs):
+        with patch('tasks.loadtest.drive', self._no_load), \
+                patch('tasks.loadtest.close_old_connections'), \
+                patch('tasks.loadtest.current_commit', return_value=None):
+            return run_load_test([5], {'suggest': 1.0}, workspace_slug=slug, **kwargs)
+    
+    def test_existing_workspace_is_left_alone(self):
+        """
+        An existing slug should be refused without touching its tasks, and
+        with reuse it is seeded but never dropped; a workspace the run
+        created is dropped afterwards
+        """
+        print("\n=== Load Test: Workspace Safety ===")
+        
+        acme = Workspace.objects.create(slug='acme', name='Acme')
+        make_task('Real work', workspace=acme)
+        
+        with self.assertRaises(LoadTestError):
+            self._run('acme')
+        self.assertTrue(Workspace.objects.filter(slug='acme').exists())
+        self.assertEqual(list(acme.tasks.values_list('title', flat=True)), ['Real work'])
+        
+        report = self._run('acme', reuse=True)
+        self.assertEqual(report['runs'][0]['tasks'], 5)
+        self.assertTrue(Workspace.objects.filter(slug='acme').exists())
+        self.assertEqual(acme.tasks.count(), 5)
+        
+        self._run('scratch')
+        self.assertFalse(Workspace.objects.filter(slug='scratch').exists())
+        self._run('kept', keep=True)
+        self.assertTrue(Workspace.objects.filter(slug='kept').exists())
+        
+        print("✅ Load test workspace safety passed!")
+
+
+class RecurringTaskTestCase(TestCase):
+    """Test cases for lazily expanded recurring tasks"""
+    
+    def test_occurrences_are_created_within_the_horizon(self):
+        """
+        A rule should only produce occurrences due inside the horizon, in
+        bulk during the rescore, without duplicates across runs
+        """
+        print("\n=== Recurrence Test: Lazy Expansion ===")
+        
+        monthly = RecurringTask(
+            frequency=RecurringTask.FREQUENCY_MONTHLY, interval=1,
+            start_date=date(2025, 1, 31)
+        )
+        self.assertEqual(
+            list(occurrence_dates(monthly, date(2025, 2, 1), date(2025, 4, 30))),
+            [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)],
+            "Monthly dates clamp to the end of short months"
+        )
+        
+        today = date.today()
+        with self.settings(SCORING_WORKER_ENABLED=True):
+            response = self.client.post('/api/recurring/', {
+                'title': "Weekly report",
+                'estimated_hours': 1,
+                'importance': 7,
+                'frequency': 'weekly',
+                'start_date': today.isoformat(),
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        rule = RecurringTask.objects.get()
+        self.assertEqual(Task.objects.count(), 0, "Saving a rule only queues a rescore")
+        
+        run_pending_jobs()
+        occurrences = list(rule.occurrences.order_by('due_date').values_list('due_date', flat=True))
+        print(f"Occurrences after first rescore: {occurrences}")
+        self.assertEqual(occurrences, [today, today + timedelta(days=7), today + timedelta(days=14)])
+        self.assertTrue(all(
+            score is not None for score in rule.occurrences.values_list('priority_score', flat=True)
+        ), "Occurrences are scored in the same pass")
+        
+        rescore_tasks(today=today)
+        self.assertEqual(rule.occurrences.count(), 3, "Reruns don't duplicate occurrences")
+        
+        rescore_tasks(today=today + timedelta(days=7))
+        self.assertEqual(rule.occurrences.count(), 4, "The horizon moves with the date")
+        
+        suggestions = self.client.get('/api/tasks/suggest/').json()['suggestions']
+        self.assertIn(rule.id, [s['task']['recurrence'] for s in suggestions])
+        
+        # Editing the rule replaces the upcoming open occurrences
+        rule.occurrences.filter(due_date=today).update(is_completed=True)
+        with self.settings(SCORING_WORKER_ENABLED=True):
+            response = self.client.patch(
+                f'/api/recurring/{rule.id}/', {'importance': 3}, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(rule.occurrences.count(), 1, "Only the completed occurrence is kept")
+        self.assertEqual(expand_recurrences(today=today), 2)
+        self.assertEqual(
+            set(rule.occurrences.filter(is_completed=False).values_list('importance', flat=True)), {3}
+        )
+        
+        print("✅ Lazy expansion passed!")
+    
+    def test_rule_changes_apply_without_a_worker(self):
+        """
+        With no scoring worker, creating or editing a rule should expand it
+        inline, so the plan shows its upcoming occurrences right away
+        """
+        print("\n=== Recurrence Test: Inline Expansion ===")
+        
+        today = date.today()
+        with self.settings(SCORING_WORKER_ENABLED=False):
+            response = self.client.post('/api/recurring/', {
+                'title': "Water the plants",
+                'estimated_hours': 0.5,
+                'importance': 4,
+                'frequency': 'daily',
+                'interval': 2,
+                'start_date': today.isoformat(),
+            }, content_type='application/json')
+            self.assertEqual(response.status_code, 201)
+            rule = RecurringTask.objects.get()
+            self.assertEqual(rule.occurrences.count(), 8)
+            
+            response = self.client.patch(
+                f'/api/recurring/{rule.id}/', {'title': "Water the garden"},
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+            plan = self.client.get('/api/tasks/plan/?days=3').json()
+        
+        titles = [entry['title'] for day in plan['days'] for entry in day['tasks']]
+        print(f"Planned: {titles}")
+        self.assertEqual(titles, ["Water the garden"] * 8)
+        self.assertFalse(rule.occurrences.filter(title="Water the plants").exists())
+        self.assertEqual(ScoringJob.objects.filter(status=ScoringJob.STATUS_PENDING).count(), 0)
+        
+        print("✅ Inline expansion passed!")
+
+
+class StartupTestCase(SimpleTestCase):
+    """Test cases for worker warm-up and optional imports"""
+    
+    def test_preload_and_optional_imports(self):
+        """
+        Preloading should resolve the task routes up front, and optional
+        dependencies should resolve to None when missing instead of failing
+        """
+        print("\n=== Startup Test: Preload and Optional Imports ===")
+        
+        preload()
+        self.assertEqual(resolve('/api/tasks/stats/').url_name, 'task-stats')
+        
+        self.assertIsNone(optional_import('not_an_installed_engine'))
+        self.assertIs(optional_import('json'), json)
+        
+        print("✅ Preload and optional imports passed!")
@@ -1,10 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet
+from .views import RecurringTaskViewSet, TaskViewSet, priority_stream
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet)
+router.register(r'recurring', RecurringTaskViewSet)
 
 urlpatterns = [
+    # Must come before the router so "stream" is not read as a task pk
+    path('tasks/stream/', priority_stream, name='task-stream'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
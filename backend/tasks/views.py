@@ -1,43 +1,74 @@
-from rest_framework import viewsets
+from datetime import date
+from asgiref.sync import sync_to_async
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import Task
-from .serializers import TaskSerializer, TaskSuggestionSerializer
-from .scoring import TaskScorer, has_circular_dependency
+from . import pipeline
+from .models import RecurringTask, Task, TaskDependency
+from .serializers import (
+    BulkActionSerializer, RecurringTaskSerializer, TaskSerializer, TaskSuggestionSerializer,
+)
+from .scoring import TaskScorer
+from .events import get_broadcaster
+from .tenancy import resolve_workspace, workspace_tasks
+from .dependencies import ready_tasks
+from .bulk import apply_bulk_action
+from .planning import PlanGenerator
+from .stats import task_stats
+from .graph import get_dependency_graph
+from .recurrence import discard_future_occurrences
+from .worker import enqueue_rescore, run_pending_jobs, scoring_status
 
 @method_decorator(csrf_exempt, name='dispatch')
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.workspace = resolve_workspace(request)
+        self.workspace_id = self.workspace.id if self.workspace else None
+        # One date for the whole request so scores can't straddle midnight
+        self.today = date.today()
+        self.scorer = TaskScorer(today=self.today)
+    
+    def get_queryset(self):
+        """Every query is restricted to the request's workspace"""
+        return workspace_tasks(self.workspace_id)
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['workspace'] = getattr(self, 'workspace', None)
+        return context
+    
+    def perform_create(self, serializer):
+        serializer.save(workspace=self.workspace)
+    
     @action(detail=False, methods=['post'])
     def analyze(self, request):
         """
         POST /api/tasks/analyze/
-        Accepts list of tasks and returns them sorted by priority
+        Queues a rescore and returns the latest persisted ranking
         Uses the Smart Balance strategy by default
         """
-        # Get all incomplete tasks
-        tasks = Task.objects.filter(is_completed=False)
+        enqueue_rescore(self.workspace_id, today=self.today)
+        if not settings.SCORING_WORKER_ENABLED:
+            # No background worker configured, score this workspace inline
+            run_pending_jobs(workspace_id=self.workspace_id)
         
-        if not tasks.exists():
-            return Response([])
+        tasks = self.get_queryset().filter(is_completed=False).order_by(
+            F('priority_score').desc(nulls_last=True), 'due_date'
+        )
         
-        # Calculate scores using Smart Balance algorithm
-        scorer = TaskScorer()
-        all_tasks_list = list(tasks)
-        
-        for task in all_tasks_list:
-            task.priority_score = scorer.calculate_priority_score(task, all_tasks_list)
-            task.save()
-        
-        # Sort by score (highest first)
-        sorted_tasks = sorted(all_tasks_list, key=lambda t: t.priority_score, reverse=True)
-        
-        serializer = TaskSerializer(sorted_tasks, many=True)
-        return Response(serializer.data)
+        return Response({
+            'status': scoring_status(self.workspace_id, today=self.today),
+            'tasks': pipeline.ranking(tasks, TaskSerializer)
+        })
     
     @action(detail=False, methods=['get'])
     def suggest(self, request):
@@ -45,151 +76,174 @@ class TaskViewSet(viewsets.ModelViewSet):
         GET /api/tasks/suggest/
         Returns top 3 tasks to work on today with explanations
         """
-        tasks = Task.objects.filter(is_completed=False)
-        
-        if not tasks.exists():
-            return Response({"suggestions": []})
-        
-        # Calculate scores
-        scorer = TaskScorer()
-        all_tasks_list = list(tasks)
-        
-        task_scores = []
-        for task in all_tasks_list:
-            score = scorer.calculate_priority_score(task, all_tasks_list)
-            reason = scorer.generate_suggestion_reason(task, all_tasks_list)
-            task_scores.append({
-                'task': task,
-                'score': score,
-                'reason': reason
-            })
-        
-        # Sort and get top 3
-        task_scores.sort(key=lambda x: x['score'], reverse=True)
-        top_3 = task_scores[:3]
+        tasks = self.get_queryset().filter(is_completed=False)
+        top_3 = pipeline.suggestions(tasks, self.scorer, k=3)
         
         serializer = TaskSuggestionSerializer(top_3, many=True)
         return Response({"suggestions": serializer.data})
     
+    @action(detail=True, methods=['get'])
+    def explain(self, request, pk=None):
+        """
+        GET /api/tasks/<id>/explain/
+        Every score component with its value, weight and contribution
+        """
+        task = self.get_object()
+        blocked_count = TaskDependency.objects.filter(
+            depends_on=task, task__is_completed=False
+        ).count()
+        return Response(self.scorer.explain(task, blocked_count).as_dict())
+    
     @action(detail=False, methods=['get'])
-    def dependency_graph(self, request):
-        """GET /api/tasks/dependency_graph/"""
-        tasks = Task.objects.all()
-        
-        # Build dependency map
-        dep_map = {t.id: list(t.dependencies) for t in tasks}
-        
-        # Find circular dependencies
-        circular_tasks = set()
-        for task_id in dep_map.keys():
-            if has_circular_dependency(task_id, dep_map):
-                circular_tasks.add(task_id)
-        
-        # Build graph data
-        nodes = []
-        edges = []
-        
-        for task in tasks:
-            nodes.append({
-                'id': task.id,
-                'title': task.title,
-                'has_cycle': task.id in circular_tasks
-            })
-            
-            for dep_id in task.dependencies:
-                edges.append({
-                    'from': dep_id,  # Dependency
-                    'to': task.id,    # Task that depends on it
-                    'has_cycle': task.id in circular_tasks or dep_id in circular_tasks
-                })
-        
+    def ready(self, request):
+        """
+        GET /api/tasks/ready/
+        Open tasks whose dependencies are all complete, highest priority first
+        """
+        tasks = ready_tasks(self.get_queryset())
+        return Response(pipeline.ranking(tasks, TaskSerializer))
+    
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        GET /api/tasks/stats/
+        Totals, completion rate and breakdowns computed by the database
+        """
+        return Response(task_stats(self.get_queryset(), today=self.today))
+    
+    @action(detail=False, methods=['get'])
+    def plan(self, request):
+        """
+        GET /api/tasks/plan/?hours_per_day=6&days=5
+        Returns a dependency-respecting daily schedule that fits the hours budget
+        """
+        try:
+            hours_per_day = float(request.query_params.get('hours_per_day', 6))
+            days = int(request.query_params.get('days', 5))
+        except ValueError:
+            return Response(
+                {'error': "hours_per_day must be a number and days an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not (0 < hours_per_day <= 24) or not (1 <= days <= 365):
+            return Response(
+                {'error': "hours_per_day must be in (0, 24] and days in [1, 365]"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        tasks = self.get_queryset().filter(is_completed=False)
+        generator = PlanGenerator(
+            scorer=self.scorer,
+            hours_per_day=hours_per_day,
+            horizon_days=days,
+            start_date=self.today
+        )
+        return Response(generator.generate(tasks))
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        POST /api/tasks/bulk/
+        {"action": "complete" | "reprioritize" | "delete",
+         "ids": [...] or "filter": {"importance__lte": 3, ...},
+         "importance": 8, "due_date": "2025-12-01"}
+        Applies the action to every matching task in one transaction
+        """
+        serializer = BulkActionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        
+        tasks = self.get_queryset()
+        if 'ids' in data:
+            tasks = tasks.filter(id__in=data['ids'])
+        else:
+            tasks = tasks.filter(**data['filter'])
+        
+        result = apply_bulk_action(
+            tasks, data['action'],
+            workspace_id=self.workspace_id,
+            scorer=self.scorer,
+            changes=serializer.changes()
+        )
         return Response({
-            'nodes': nodes,
-            'edges': edges,
-            'has_cycles': len(circular_tasks) > 0
+            'action': result['action'],
+            'matched': len(result['task_ids']),
+            'task_ids': result['task_ids'],
+            'rescored': result['rescored'],
         })
     
     @action(detail=False, methods=['get'])
     def dependency_graph(self, request):
         """GET /api/tasks/dependency_graph/"""
-        tasks = Task.objects.all()
-        
-        # Build dependency map
-        dep_map = {t.id: list(t.dependencies) for t in tasks}
-        
-        # Find circular dependencies
-        circular_tasks = set()
-        for task_id in dep_map.keys():
-            if has_circular_dependency(task_id, dep_map):
-                circular_tasks.add(task_id)
-        
-        # Build graph data
-        nodes = []
-        edges = []
-        
-        for task in tasks:
-            nodes.append({
-                'id': task.id,
-                'title': task.title,
-                'has_cycle': task.id in circular_tasks
-            })
-            
-            for dep_id in task.dependencies:
-                edges.append({
-                    'from': dep_id,  # Dependency
-                    'to': task.id,    # Task that depends on it
-                    'has_cycle': task.id in circular_tasks or dep_id in circular_tasks
-                })
-        
-        return Response({
-            'nodes': nodes,
-            'edges': edges,
-            'has_cycles': len(circular_tasks) > 0
-        })
+        return Response(get_dependency_graph(self.workspace_id))
     
     @action(detail=False, methods=['get'])
     def eisenhower_matrix(self, request):
         """GET /api/tasks/eisenhower_matrix/"""
-        tasks = Task.objects.filter(is_completed=False)
-        
-        if not tasks.exists():
-            return Response({
-                'DO_FIRST': [],
-                'SCHEDULE': [],
-                'DELEGATE': [],
-                'ELIMINATE': []
-            })
-        
-        scorer = TaskScorer()
-        all_tasks_list = list(tasks)
-        
-        # Categorize tasks
-        matrix = {
-            'DO_FIRST': [],
-            'SCHEDULE': [],
-            'DELEGATE': [],
-            'ELIMINATE': []
-        }
-        
-        for task in all_tasks_list:
-            urgency = scorer.calculate_urgency(task.due_date, task.importance)
-            is_urgent = urgency >= 70
-            is_important = task.importance >= 7
-            
-            # Categorize
-            if is_urgent and is_important:
-                category = 'DO_FIRST'
-            elif not is_urgent and is_important:
-                category = 'SCHEDULE'
-            elif is_urgent and not is_important:
-                category = 'DELEGATE'
-            else:
-                category = 'ELIMINATE'
-            
-            serializer = TaskSerializer(task)
-            task_data = serializer.data
-            task_data['urgency'] = urgency
-            
-            matrix[category].append(task_data)
-        
-        return Response(matrix)
\ No newline at end of file
+        tasks = self.get_queryset().filter(is_completed=False)
+        return Response(pipeline.eisenhower_matrix(tasks, self.scorer, TaskSerializer))
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class RecurringTaskViewSet(viewsets.ModelViewSet):
+    """
+    Recurring task rules. Occurrences are created by the scoring worker
+    as the rule's dates come within RECURRENCE_HORIZON_DAYS, so saving a
+    rule only queues a rescore; without a worker it runs inline, like
+    analyze, so the upcoming occurrences exist when the response returns.
+    """
+    queryset = RecurringTask.objects.all()
+    serializer_class = RecurringTaskSerializer
+    
+    # Fields that change which occurrences a rule produces, or their content
+    RULE_FIELDS = (
+        'title', 'estimated_hours', 'importance', 'frequency', 'interval',
+        'start_date', 'end_date', 'is_active',
+    )
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.workspace = resolve_workspace(request)
+        self.workspace_id = self.workspace.id if self.workspace else None
+        self.today = date.today()
+    
+    def get_queryset(self):
+        return RecurringTask.objects.filter(workspace_id=self.workspace_id)
+    
+    def perform_create(self, serializer):
+        serializer.save(workspace=self.workspace)
+        self._rescore()
+    
+    def perform_update(self, serializer):
+        before = {field: getattr(serializer.instance, field) for field in self.RULE_FIELDS}
+        super().perform_update(serializer)
+        if any(getattr(serializer.instance, field) != value for field, value in before.items()):
+            discard_future_occurrences(serializer.instance, self.today)
+            self._rescore()
+    
+    def _rescore(self):
+        enqueue_rescore(self.workspace_id, today=self.today)
+        if not settings.SCORING_WORKER_ENABLED:
+            # No background worker configured, expand and score inline
+            run_pending_jobs(workspace_id=self.workspace_id)
+    
+    def perform_destroy(self, instance):
+        discard_future_occurrences(instance, self.today)
+        super().perform_destroy(instance)
+
+
+async def priority_stream(request):
+    """
+    GET /api/tasks/stream/?workspace=<slug>
+    Server-Sent Events feed of priority_score and top suggestion changes
+    """
+    workspace = await sync_to_async(resolve_workspace)(request)
+    broadcaster = get_broadcaster(workspace.id if workspace else None)
+    response = StreamingHttpResponse(
+        broadcaster.stream(),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
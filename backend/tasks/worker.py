@@ -0,0 +1,227 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from . import pipeline
+from .events import notify_priority_change
+from .models import RecurringTask, ScoringJob, Task
+from .recurrence import expand_recurrences
+from .scoring import TaskScorer
+from .tenancy import workspace_tasks
+
+DEFAULT_BATCH_SIZE = 500
+
+# claim_next_job/run_pending_jobs default: take jobs from every workspace
+ANY_WORKSPACE = object()
+
+
+def enqueue_rescore(workspace_id=None, kind=ScoringJob.KIND_RESCORE, today=None):
+    """
+    Queue a rescore of one workspace, coalescing it into an already pending
+    job. Every rescore is a full pass over the workspace, so one pending job
+    covers any number of requests made before a worker picks it up.
+    Only single write statements are used (no read-then-write transaction),
+    so concurrent requests wait for SQLite's write lock instead of failing;
+    the one_pending_job_per_workspace constraint keeps the coalescing exact.
+    """
+    today = today or date.today()
+    pending = ScoringJob.objects.filter(
+        workspace_id=workspace_id, status=ScoringJob.STATUS_PENDING
+    )
+    if kind == ScoringJob.KIND_ROLLOVER:
+        changes = {'kind': kind, 'scoring_date': today}
+    else:
+        # A job queued on an earlier day moves to today; SET sees the old row
+        outdated = Q(scoring_date__lt=today)
+        changes = {
+            'kind': Case(When(outdated, then=Value(kind)), default=F('kind')),
+            'scoring_date': Case(When(outdated, then=Value(today)), default=F('scoring_date')),
+        }
+
+    while True:
+        if pending.update(request_count=F('request_count') + 1, **changes):
+            job = pending.first()
+            if job is not None:
+                return job
+            # Claimed right after the update; that run starts after our writes
+            return ScoringJob.objects.filter(workspace_id=workspace_id).last()
+        try:
+            with transaction.atomic():
+                return ScoringJob.objects.create(
+                    workspace_id=workspace_id, kind=kind, scoring_date=today
+                )
+        except IntegrityError:
+            # Another request queued the pending job first, coalesce into it
+            continue
+
+
+def ensure_daily_rollover(today=None):
+    """
+    Queue the once-a-day rescore that moves urgency to the new date,
+    one job per workspace that has open tasks or active recurring tasks.
+    Returns the queued jobs.
+    """
+    today = today or date.today()
+    reclaim_stale_jobs()
+    covered = set(
+        ScoringJob.objects.filter(
+            scoring_date=today,
+            status__in=[
+                ScoringJob.STATUS_PENDING,
+                ScoringJob.STATUS_RUNNING,
+                ScoringJob.STATUS_DONE,
+            ],
+        ).values_list('workspace_id', flat=True)
+    )
+    workspace_ids = set(
+        Task.objects.filter(is_completed=False).order_by()
+        .values_list('workspace_id', flat=True).distinct()
+    ) | set(
+        RecurringTask.objects.filter(is_active=True).order_by()
+        .values_list('workspace_id', flat=True).distinct()
+    )
+    return [
+        enqueue_rescore(workspace_id, ScoringJob.KIND_ROLLOVER, today)
+        for workspace_id in workspace_ids
+        if workspace_id not in covered
+    ]
+
+
+def lease_expired_before():
+    """Running jobs started before this are presumed to have lost their worker"""
+    return timezone.now() - timedelta(seconds=settings.SCORING_JOB_LEASE_SECONDS)
+
+
+def reclaim_stale_jobs():
+    """
+    Fail running jobs whose lease expired (their worker crashed or was
+    killed) and queue their work again. Returns the requeued jobs.
+    """
+    requeued = []
+    stale = ScoringJob.objects.filter(
+        status=ScoringJob.STATUS_RUNNING, started_at__lt=lease_expired_before()
+    )
+    for job in stale:
+        # Compare-and-set so only one process reclaims each job
+        reclaimed = ScoringJob.objects.filter(
+            pk=job.pk, status=ScoringJob.STATUS_RUNNING
+        ).update(
+            status=ScoringJob.STATUS_FAILED,
+            error="Lease expired, the worker stopped before finishing",
+            finished_at=timezone.now(),
+        )
+        if reclaimed:
+            requeued.append(enqueue_rescore(job.workspace_id, job.kind, job.scoring_date))
+    return requeued
+
+
+def claim_next_job(workspace_id=ANY_WORKSPACE):
+    """
+    Atomically move the oldest pending job to running, or return None.
+    With workspace_id, only that workspace's jobs are considered.
+    """
+    reclaim_stale_jobs()
+    pending = ScoringJob.objects.filter(status=ScoringJob.STATUS_PENDING)
+    if workspace_id is not ANY_WORKSPACE:
+        pending = pending.filter(workspace_id=workspace_id)
+    while True:
+        job = pending.first()
+        if job is None:
+            return None
+        # Compare-and-set so concurrent workers never run the same job
+        claimed = ScoringJob.objects.filter(
+            pk=job.pk, status=ScoringJob.STATUS_PENDING
+        ).update(status=ScoringJob.STATUS_RUNNING, started_at=timezone.now())
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def rescore_tasks(workspace_id=None, batch_size=DEFAULT_BATCH_SIZE, today=None):
+    """
+    Recompute and persist priority_score for a workspace's incomplete tasks.
+    Recurring tasks that came into the horizon are created first, in bulk,
+    so they are scored in the same pass. Blocked counts come from one
+    streamed pass over the dependency lists, then tasks are scored and
+    written back batch_size rows at a time.
+    """
+    expand_recurrences(workspace_id, today)
+    incomplete = workspace_tasks(workspace_id).filter(is_completed=False).order_by()
+    scored = pipeline.rescore(incomplete, TaskScorer(today=today), _save_scores, batch_size)
+
+    # bulk_update bypasses post_save, so tell SSE subscribers directly
+    transaction.on_commit(lambda: notify_priority_change(workspace_id))
+    return scored
+
+
+def _save_scores(batch):
+    with transaction.atomic():
+        Task.objects.bulk_update(batch, ['priority_score'])
+    return len(batch)
+
+
+def run_job(job, batch_size=DEFAULT_BATCH_SIZE):
+    """Execute a claimed job and record the outcome on it"""
+    try:
+        job.tasks_scored = rescore_tasks(job.workspace_id, batch_size, job.scoring_date)
+        job.status = ScoringJob.STATUS_DONE
+    except Exception as e:
+        job.status = ScoringJob.STATUS_FAILED
+        job.error = str(e)
+    job.finished_at = timezone.now()
+    # A job whose lease expired was already failed and requeued; keep that
+    ScoringJob.objects.filter(pk=job.pk, status=ScoringJob.STATUS_RUNNING).update(
+        tasks_scored=job.tasks_scored,
+        status=job.status,
+        error=job.error,
+        finished_at=job.finished_at,
+    )
+    return job
+
+
+def run_pending_jobs(batch_size=DEFAULT_BATCH_SIZE, workspace_id=ANY_WORKSPACE):
+    """Drain the queue (or one workspace's part of it), returns the number of jobs processed"""
+    processed = 0
+    while True:
+        job = claim_next_job(workspace_id)
+        if job is None:
+            return processed
+        run_job(job, batch_size)
+        processed += 1
+
+
+def scoring_status(workspace_id=None, today=None):
+    """Describe how fresh a workspace's persisted priority scores are"""
+    today = today or date.today()
+    jobs = ScoringJob.objects.filter(workspace_id=workspace_id)
+    active = (
+        jobs
+        .filter(
+            Q(status=ScoringJob.STATUS_PENDING) |
+            Q(status=ScoringJob.STATUS_RUNNING, started_at__gte=lease_expired_before())
+        )
+        .order_by('-created_at')
+        .first()
+    )
+    last_done = (
+        jobs
+        .filter(status=ScoringJob.STATUS_DONE)
+        .order_by('-finished_at')
+        .first()
+    )
+
+    if active is not None:
+        state = 'running' if active.status == ScoringJob.STATUS_RUNNING else 'queued'
+    elif last_done is None or last_done.scoring_date < today:
+        state = 'stale'
+    else:
+        state = 'fresh'
+
+    return {
+        'state': state,
+        'scored_at': last_done.finished_at if last_done else None,
+        'pending_job': active.id if active else None,
+    }
@@ -396,7 +396,8 @@ document.getElementById("analyzeTasks").addEventListener("click", async () => {
 
         if (!response.ok) throw new Error("Analysis failed");
 
-        sortedTasks = await response.json();
+        const analysis = await response.json();
+        sortedTasks = analysis.tasks;
         break;
     }
 